@@ -0,0 +1,84 @@
+# benchmarks/bench_duckdb.py
+#
+# Panel and table queries answered by the DuckDB engine over a Parquet
+# export versus the in-memory engine over the same export: time to get ready,
+# time per query, and peak RSS growth (the in-memory engine loads and indexes
+# everything up front, DuckDB only reads what each query needs).
+#
+#   python benchmarks/bench_duckdb.py [n_customers] [days] [parquet_dir]
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.cache import build_dataset
+from innbucks.cube import CubePanels
+from innbucks.data import generate_innbucks_data
+from innbucks.duck import DuckDBQueries
+from innbucks.table import DatasetTables
+
+QUERIES = {
+    'panels': lambda panels, tables: panels.results(),
+    'customers page': lambda panels, tables: tables.page('customers', 3, 50, {'region': ['Harare']}, 'branch'),
+    'latest 100': lambda panels, tables: tables.latest(101, 0, {'channel': ['USSD']}),
+}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def export(directory, n_customers, days):
+    customers_df, accounts_df, transactions_df = generate_innbucks_data(n_customers=n_customers, days=days)
+    customers_df.to_parquet(os.path.join(directory, 'customers.parquet'))
+    accounts_df.to_parquet(os.path.join(directory, 'accounts.parquet'))
+    transactions_df.to_parquet(os.path.join(directory, 'transactions.parquet'), row_group_size=100_000)
+
+
+def time_queries(panels, tables, repeat=5):
+    timings = {}
+    for name, query in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            query(panels, tables)
+        timings[name] = (time.perf_counter() - start) / repeat
+    return timings
+
+
+def main(argv):
+    n_customers = int(argv[0]) if len(argv) > 0 else 100_000
+    days = int(argv[1]) if len(argv) > 1 else 30
+    directory = argv[2] if len(argv) > 2 else tempfile.mkdtemp(prefix='innbucks-parquet-')
+    if not os.path.exists(os.path.join(directory, 'transactions.parquet')):
+        # In a child process, so generating the data does not count towards RSS here
+        child = multiprocessing.Process(target=export, args=(directory, n_customers, days))
+        child.start()
+        child.join()
+    print(f"Parquet export in {directory}")
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    queries = DuckDBQueries(directory)
+    duck_ready = time.perf_counter() - start
+    duck = time_queries(queries, queries)
+    duck_rss = peak_rss_mb() - baseline
+
+    start = time.perf_counter()
+    dataset = build_dataset(source=f'parquet:{directory}')
+    memory_ready = time.perf_counter() - start
+    memory = time_queries(CubePanels(dataset.cube, dataset.customer_cube), DatasetTables(dataset))
+    memory_rss = peak_rss_mb() - baseline
+
+    print(f"{'':<18} {'duckdb':>10} {'memory':>10}")
+    print(f"{'ready (s)':<18} {duck_ready:>10.3f} {memory_ready:>10.3f}")
+    print(f"{'RSS growth (MB)':<18} {duck_rss:>10.0f} {memory_rss:>10.0f}")
+    for name in QUERIES:
+        print(f"{name + ' (ms)':<18} {duck[name] * 1000:>10.1f} {memory[name] * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,38 @@
+# benchmarks/bench_generate.py
+#
+# Times generate_compact_data() (the layout the dashboard uses) and
+# generate_innbucks_data() (formatted string ids) at increasing customer counts.
+#
+#   python benchmarks/bench_generate.py [n_customers ...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.data import generate_compact_data, generate_innbucks_data
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(f"{'customers':>12} {'transactions':>14} {'compact s':>10} {'strings s':>10} {'compact txn/s':>14}")
+    for n_customers in sizes:
+        start = time.perf_counter()
+        _, _, transactions_df, _ = generate_compact_data(n_customers=n_customers)
+        compact_elapsed = time.perf_counter() - start
+        n_transactions = len(transactions_df)
+        del transactions_df
+
+        start = time.perf_counter()
+        generate_innbucks_data(n_customers=n_customers)
+        strings_elapsed = time.perf_counter() - start
+        print(
+            f"{n_customers:>12,} {n_transactions:>14,} {compact_elapsed:>10.3f} {strings_elapsed:>10.3f}"
+            f" {n_transactions / compact_elapsed:>14,.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
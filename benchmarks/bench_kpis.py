@@ -0,0 +1,59 @@
+# benchmarks/bench_kpis.py
+#
+# Checks windowed KPIs from DailyPrefixSums against brute-force
+# calculate_kpis() over the same date window, and times both.
+#
+#   python benchmarks/bench_kpis.py [n_customers] [days] [n_windows]
+import os
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.cache import build_dataset
+from innbucks.data import calculate_kpis
+from innbucks.store import day_window
+
+CHECKED = ['total_transactions', 'total_volume', 'avg_transaction_size']
+
+
+def main(argv):
+    n_customers = int(argv[0]) if len(argv) > 0 else 100_000
+    days = int(argv[1]) if len(argv) > 1 else 365
+    n_windows = int(argv[2]) if len(argv) > 2 else 50
+
+    dataset = build_dataset(n_customers=n_customers, days=days)
+    first_day, last_day = dataset.store.first_date.date(), dataset.store.last_date.date()
+    n_days = (last_day - first_day).days + 1
+    print(f"{len(dataset.transactions_df):,} transactions over {n_days} days, {n_windows} random windows")
+
+    rng = np.random.default_rng(0)
+    brute_seconds = prefix_seconds = 0.0
+    for _ in range(n_windows):
+        a, b = sorted(rng.integers(0, n_days, 2))
+        start_day = first_day + timedelta(days=int(a))
+        end_day = first_day + timedelta(days=int(b))
+
+        start = time.perf_counter()
+        window = dataset.store.window(*day_window(start_day, end_day))
+        expected = calculate_kpis(dataset.customers_df, dataset.accounts_df, window)
+        brute_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = dataset.prefix.window_kpis(dataset.kpis, start_day, end_day)
+        prefix_seconds += time.perf_counter() - start
+
+        for key in CHECKED:
+            if not np.isclose(actual[key], expected[key], rtol=1e-12, equal_nan=True):
+                raise AssertionError(f"{key} for {start_day}..{end_day}: {actual[key]!r} != {expected[key]!r}")
+
+    print(f"all {n_windows} windows match calculate_kpis on {', '.join(CHECKED)}")
+    print(f"brute force  {brute_seconds / n_windows * 1e3:>10.3f} ms/window")
+    print(f"prefix sums  {prefix_seconds / n_windows * 1e3:>10.3f} ms/window")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
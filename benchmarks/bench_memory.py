@@ -0,0 +1,50 @@
+# benchmarks/bench_memory.py
+#
+# Compares the memory footprint of the string layout (formatted ids and
+# enumerations as Python object strings, dollar floats) with the compact
+# layout of innbucks.compact, at roughly 1M transactions.
+#
+#   python benchmarks/bench_memory.py [n_transactions]
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.compact import memory_by_column
+from innbucks.data import TRANSACTIONS_PER_ACCOUNT, generate_compact_data, generate_innbucks_data
+
+TABLES = ['customers', 'accounts', 'transactions']
+
+
+def main(argv):
+    n_transactions = int(argv[0]) if argv else 1_000_000
+    n_customers = max(1, n_transactions // TRANSACTIONS_PER_ACCOUNT)
+
+    # The original dashboard built its frames from lists of dicts, so every
+    # string column was a numpy object column of Python str
+    old_frames = generate_innbucks_data(n_customers=n_customers)
+    old_frames = [df.astype({col: object for col in df.select_dtypes('str').columns}) for df in old_frames]
+    new_frames = generate_compact_data(n_customers=n_customers)[:3]
+
+    old = memory_by_column(dict(zip(TABLES, old_frames)))
+    new = memory_by_column(dict(zip(TABLES, new_frames)))
+
+    print(f"{n_customers:,} customers, {len(new_frames[2]):,} transactions\n")
+    print(f"{'old column':<34} {'MB':>8}   {'new column':<34} {'MB':>8}")
+    old_columns, new_columns = list(old), list(new)
+    for i in range(max(len(old_columns), len(new_columns))):
+        left = f"{old_columns[i]:<34} {old[old_columns[i]] / 1e6:>8.2f}" if i < len(old_columns) else ' ' * 43
+        right = f"{new_columns[i]:<34} {new[new_columns[i]] / 1e6:>8.2f}" if i < len(new_columns) else ''
+        print(f"{left}   {right}")
+
+    print()
+    for table, old_df, new_df in zip(TABLES, old_frames, new_frames):
+        old_mb = old_df.memory_usage(deep=True).sum() / 1e6
+        new_mb = new_df.memory_usage(deep=True).sum() / 1e6
+        print(f"{table:<14} old {old_mb:>9.2f} MB   new {new_mb:>9.2f} MB   {old_mb / new_mb:>5.1f}x smaller")
+    old_total, new_total = sum(old.values()) / 1e6, sum(new.values()) / 1e6
+    print(f"{'total':<14} old {old_total:>9.2f} MB   new {new_total:>9.2f} MB   {old_total / new_total:>5.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
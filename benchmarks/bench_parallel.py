@@ -0,0 +1,47 @@
+# benchmarks/bench_parallel.py
+#
+# Times generate_compact_data() with increasing numbers of worker processes
+# and checks every run produces exactly the frames of the single-process run.
+#
+#   python benchmarks/bench_parallel.py [n_customers] [workers ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.data import generate_compact_data
+
+START_DATE = pd.Timestamp('2025-01-01')
+
+
+def generate(n_customers, workers):
+    start = time.perf_counter()
+    result = generate_compact_data(n_customers=n_customers, start_date=START_DATE, workers=workers)
+    return time.perf_counter() - start, result
+
+
+def check_identical(expected, actual):
+    for expected_df, actual_df in zip(expected[:3], actual[:3]):
+        pd.testing.assert_frame_equal(expected_df, actual_df, check_exact=True)
+    assert np.array_equal(expected[3].account_offsets, actual[3].account_offsets)
+
+
+def main(argv):
+    n_customers = int(argv[0]) if argv else 1_000_000
+    worker_counts = [int(arg) for arg in argv[1:]] or [1, 2, 4, os.cpu_count()]
+    print(f"{n_customers:,} customers on {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'txn/s':>14} {'speedup':>8}")
+    baseline_seconds, expected = generate(n_customers, 1)
+    for workers in sorted(set(worker_counts)):
+        seconds, actual = (baseline_seconds, expected) if workers == 1 else generate(n_customers, workers)
+        check_identical(expected, actual)
+        n_transactions = len(actual[2])
+        print(f"{workers:>8} {seconds:>9.3f} {n_transactions / seconds:>14,.0f} {baseline_seconds / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,48 @@
+# benchmarks/bench_payload.py
+#
+# Bytes sent to the browser per rerun by the Customer Database and Account
+# Summary tables: the whole frame (before paging) versus one page as the app
+# gets it from DatasetTables.page().
+#
+#   python benchmarks/bench_payload.py [n_customers ...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.cache import build_dataset
+from innbucks.compact import expand_frame
+from innbucks.table import DatasetTables, payload_bytes
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+PAGE_SIZE = 50
+
+
+def measure(tables, table, df):
+    start = time.perf_counter()
+    full = payload_bytes(expand_frame(df, tables.dataset.ids))
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page = payload_bytes(tables.page(table, 0, PAGE_SIZE))
+    page_seconds = time.perf_counter() - start
+    return full, full_seconds, page, page_seconds
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(f"{'table':<18} {'customers':>10} {'full bytes':>14} {'full s':>8} {'page bytes':>11} {'page s':>8}")
+    for n_customers in sizes:
+        dataset = build_dataset(n_customers=n_customers, days=1)
+        tables = DatasetTables(dataset)
+        for name, table, df in [
+            ('customers', 'customers', dataset.customers_df),
+            ('account summary', 'account_summary', dataset.account_summary.frame),
+        ]:
+            full, full_seconds, page, page_seconds = measure(tables, table, df)
+            print(f"{name:<18} {n_customers:>10,} {full:>14,} {full_seconds:>8.3f} {page:>11,} {page_seconds:>8.4f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+# benchmarks/bench_polars.py
+#
+# The dataset's aggregation passes (calculate_kpis, build_daily_cube,
+# build_customer_cube) in pandas versus Polars lazy frames (innbucks.lazy):
+# checks the results are equivalent, then times both.
+#
+#   python benchmarks/bench_polars.py [n_transactions ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.cube import CUBE_DIMENSIONS, build_customer_cube, build_daily_cube
+from innbucks.data import TRANSACTIONS_PER_ACCOUNT, calculate_kpis, generate_compact_data
+from innbucks.lazy import aggregate
+
+SIZES = [1_000_000, 10_000_000]
+REPEAT = 3
+
+
+def pandas_aggregate(customers_df, accounts_df, transactions_df):
+    return (
+        calculate_kpis(customers_df, accounts_df, transactions_df),
+        build_daily_cube(customers_df, accounts_df, transactions_df),
+        build_customer_cube(customers_df),
+    )
+
+
+def check_equivalent(expected, actual):
+    expected_kpis, expected_cube, expected_customers = expected
+    kpis, cube, customer_cube = actual
+    for key, value in expected_kpis.items():
+        if not np.isclose(kpis[key], value, rtol=1e-12, equal_nan=True):
+            raise AssertionError(f"{key}: pandas {value!r}, polars {kpis[key]!r}")
+    # Cells are ordered by date in both; within a day pandas orders by
+    # category code and Polars by label
+    pd.testing.assert_frame_equal(
+        cube, expected_cube.sort_values(CUBE_DIMENSIONS, ignore_index=True), check_exact=True
+    )
+    pd.testing.assert_frame_equal(customer_cube, expected_customers, check_exact=True)
+
+
+def best_of(func, *args):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv):
+    import polars as pl
+
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(f"Polars thread pool: {pl.thread_pool_size()} threads; best of {REPEAT}")
+    print(f"{'transactions':>13} {'pandas s':>9} {'polars s':>9} {'speedup':>8}")
+    for n_transactions in sizes:
+        customers_df, accounts_df, transactions_df, _ = generate_compact_data(
+            n_customers=max(1, n_transactions // TRANSACTIONS_PER_ACCOUNT), days=30
+        )
+        frames = (customers_df, accounts_df, transactions_df)
+        pandas_seconds, expected = best_of(pandas_aggregate, *frames)
+        polars_seconds, actual = best_of(aggregate, *frames)
+        check_equivalent(expected, actual)
+        print(f"{len(transactions_df):>13,} {pandas_seconds:>9.3f} {polars_seconds:>9.3f} "
+              f"{pandas_seconds / polars_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,161 @@
+# benchmarks/bench_rerun.py
+#
+# Drives streamlit_app2.py headlessly with streamlit.testing's AppTest and
+# measures, per dataset size:
+#   cold_ms       first run (includes building the dataset)
+#   rerun_ms      full-script rerun with nothing changed
+#   <tab>_ms      rerun after changing a filter (or the sort) in each tab
+#   peak_rss_mb   peak resident memory of the process
+# Latencies are medians over --repeat runs. Each size runs in its own
+# subprocess, so datasets and peak memory do not carry over between sizes.
+#
+# AppTest reruns the whole script even where the browser would only rerun a
+# tab's fragment, so the tab timings are upper bounds.
+#
+#   python benchmarks/bench_rerun.py [--sizes 1000 10000 ...] [--repeat 5]
+#       [--save-baseline FILE] [--compare FILE] [--tolerance 0.25]
+#
+# --compare exits with status 1 if any latency or peak memory is more than
+# `tolerance` (relative) above the baseline for the same size.
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'streamlit_app2.py')
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+TIMEOUT = 1800
+
+# tab label -> (widget kind, widget label, value to select) for the change
+# whose rerun is timed
+TAB_CHANGES = {
+    'Customer Data': ('multiselect', 'Filter by Region', 'Harare'),
+    'Transaction Data': ('multiselect', 'Filter by Channel', 'Mobile App'),
+    'Account Summary': ('selectbox', 'Sort by', 'balance_cents'),
+}
+
+
+def metric_name(tab):
+    return tab.lower().replace(' ', '_') + '_ms'
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"app raised: {[e.value for e in at.exception]}")
+    return elapsed
+
+
+def find_widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no {kind} labelled {label!r}")
+
+
+# Measure one dataset size in this process
+def measure(n_customers, repeat):
+    os.environ['INNBUCKS_CUSTOMERS'] = str(n_customers)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    result = {'n_customers': n_customers, 'cold_ms': timed_run(at)}
+    result['rerun_ms'] = statistics.median(timed_run(at) for _ in range(repeat))
+
+    for tab, (kind, label, value) in TAB_CHANGES.items():
+        at.session_state['data_view_tab'] = tab
+        timed_run(at)
+        samples = []
+        for _ in range(repeat):
+            find_widget(at, kind, label).select(value)
+            samples.append(timed_run(at))
+            widget = find_widget(at, kind, label)
+            if kind == 'multiselect':
+                widget.unselect(value)
+            else:
+                widget.select(None)
+            timed_run(at)
+        result[metric_name(tab)] = statistics.median(samples)
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['peak_rss_mb'] = peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10)
+    return result
+
+
+def run_size(n_customers, repeat):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', str(n_customers), '--repeat', str(repeat)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# (size, metric, baseline, current) for every metric over tolerance
+def regressions(baseline, results, tolerance):
+    by_size = {entry['n_customers']: entry for entry in baseline['results']}
+    found = []
+    for result in results:
+        base = by_size.get(result['n_customers'])
+        if base is None:
+            continue
+        for metric, value in result.items():
+            if metric == 'n_customers' or metric not in base:
+                continue
+            if value > base[metric] * (1 + tolerance):
+                found.append((result['n_customers'], metric, base[metric], value))
+    return found
+
+
+def print_results(results):
+    metrics = [m for m in results[0] if m != 'n_customers']
+    print(f"{'customers':>10} " + ' '.join(f"{m:>22}" for m in metrics))
+    for result in results:
+        print(f"{result['n_customers']:>10,} " + ' '.join(f"{result[m]:>22,.1f}" for m in metrics))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Headless rerun benchmarks for streamlit_app2.py")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save-baseline', metavar='FILE')
+    parser.add_argument('--compare', metavar='FILE')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        print(json.dumps(measure(args.child, args.repeat)))
+        return 0
+
+    results = [run_size(n_customers, args.repeat) for n_customers in args.sizes]
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'created_at': time.time(), 'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        found = regressions(baseline, results, args.tolerance)
+        for n_customers, metric, base, value in found:
+            print(f"REGRESSION {n_customers:,} customers {metric}: {base:,.1f} -> {value:,.1f} "
+                  f"(+{(value / base - 1):.0%})")
+        if found:
+            return 1
+        print(f"no regressions over {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
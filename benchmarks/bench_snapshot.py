@@ -0,0 +1,77 @@
+# benchmarks/bench_snapshot.py
+#
+# Cold start from a memory-mapped snapshot (innbucks.snapshot) versus
+# generating the synthetic data: time until the frames are loaded, time until
+# the whole dataset (indexes, cubes, KPIs) is built, and the resident memory
+# split into private (anonymous) pages and file-backed pages, which processes
+# opening the same snapshot share through the page cache. Each case runs in a
+# fresh subprocess. Memory is read from /proc, so this needs Linux.
+#
+#   python benchmarks/bench_snapshot.py [n_customers] [snapshot_dir]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# RssAnon and RssFile of this process, in MB
+def resident_mb():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in ('RssAnon', 'RssFile'):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields
+
+
+def child(source, n_customers):
+    from innbucks.cache import build_dataset
+    from innbucks.sources import open_source
+
+    start = time.perf_counter()
+    open_source(source, n_customers=n_customers).load_compact()
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    dataset = build_dataset(source, n_customers=n_customers)
+    build_seconds = time.perf_counter() - start
+    # Measured while the dataset is alive
+    memory = resident_mb()
+    print(json.dumps({'load_s': load_seconds, 'build_s': build_seconds, 'rows': len(dataset.transactions_df), **memory}))
+
+
+def run_child(source, n_customers):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', source, str(n_customers)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(argv):
+    n_customers = int(argv[0]) if argv else 1_000_000
+    path = argv[1] if len(argv) > 1 else os.path.join(tempfile.mkdtemp(prefix='innbucks-snapshot-'), 'snapshot')
+    if not os.path.exists(os.path.join(path, 'snapshot.json')):
+        subprocess.run(
+            [sys.executable, '-m', 'innbucks.snapshot', path, '--customers', str(n_customers)],
+            check=True, cwd=ROOT,
+        )
+
+    cases = {'synthetic': run_child('synthetic', n_customers), 'snapshot': run_child(f'snapshot:{path}', n_customers)}
+    print(f"{cases['synthetic']['rows']:,} transactions")
+    print(f"{'':<16} {'load s':>8} {'build s':>8} {'private MB':>11} {'shared MB':>10}")
+    for name, result in cases.items():
+        print(f"{name:<16} {result['load_s']:>8.3f} {result['build_s']:>8.3f} "
+              f"{result['RssAnon']:>11.0f} {result['RssFile']:>10.0f}")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,176 @@
+# benchmarks/load_sessions.py
+#
+# Load test: N simulated sessions, each an AppTest of streamlit_app2.py on
+# its own thread, replaying a random mix of interactions (switching tabs,
+# toggling filters, narrowing the date range, plain reruns) against one
+# process, so they share the process-wide caches exactly as sessions on one
+# server do. Reports, per session count:
+#   reruns/s           completed reruns per second across all sessions
+#   p50/p95/p99 ms     rerun latency
+#   rss_mb             resident memory at the end, and per session
+# Each session count runs in its own subprocess. Memory is read from /proc,
+# so this runs on Linux only.
+#
+#   python benchmarks/load_sessions.py [--sessions 1 2 4 8] [--interactions 20]
+#       [--customers 1000] [--seed 0]
+import argparse
+import datetime
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'streamlit_app2.py')
+
+SESSIONS = [1, 2, 4, 8]
+TIMEOUT = 1800
+
+TABS = ['Customer Data', 'Transaction Data', 'Account Summary']
+
+# Filter widgets per tab: (label, options to toggle)
+TAB_FILTERS = {
+    'Customer Data': [
+        ('Filter by Region', ['Harare', 'Bulawayo', 'Midlands', 'Masvingo']),
+        ('Filter by KYC Status', ['Verified', 'Pending']),
+    ],
+    'Transaction Data': [
+        ('Filter by Type', ['Send Money', 'Cash Out', 'Bill Payment']),
+        ('Filter by Channel', ['Mobile App', 'USSD', 'Agent']),
+    ],
+    'Account Summary': [],
+}
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+
+
+def multiselect(at, label):
+    for widget in at.multiselect:
+        if widget.label == label:
+            return widget
+    return None
+
+
+# One user: a fixed number of random interactions, each followed by a rerun
+class Session:
+    def __init__(self, seed):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = np.random.default_rng(seed)
+        self.at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+        self.tab = TABS[0]
+        self.latencies = []
+        self.errors = 0
+
+    def rerun(self):
+        start = time.perf_counter()
+        self.at.run()
+        self.latencies.append(time.perf_counter() - start)
+        if self.at.exception:
+            self.errors += 1
+
+    def interact(self):
+        at, rng = self.at, self.rng
+        action = rng.choice(['tab', 'filter', 'filter', 'dates', 'rerun'])
+        if action == 'tab':
+            self.tab = TABS[rng.integers(len(TABS))]
+            at.session_state['data_view_tab'] = self.tab
+        elif action == 'filter' and TAB_FILTERS[self.tab]:
+            label, options = TAB_FILTERS[self.tab][rng.integers(len(TAB_FILTERS[self.tab]))]
+            widget = multiselect(at, label)
+            value = options[rng.integers(len(options))]
+            if widget is not None:
+                if value in widget.value:
+                    widget.unselect(value)
+                else:
+                    widget.select(value)
+        elif action == 'dates' and len(at.sidebar.date_input):
+            widget = at.sidebar.date_input[0]
+            first, last = widget.min, widget.max
+            n_days = (last - first).days
+            a, b = sorted(rng.integers(0, n_days + 1, 2))
+            widget.set_value((first + datetime.timedelta(days=int(a)), first + datetime.timedelta(days=int(b))))
+        self.rerun()
+
+    def run(self, n_interactions):
+        self.rerun()
+        for _ in range(n_interactions):
+            self.interact()
+
+
+def measure(n_sessions, n_interactions, seed):
+    sessions = [Session(seed + i) for i in range(n_sessions)]
+    threads = [threading.Thread(target=s.run, args=(n_interactions,)) for s in sessions]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([s.latencies for s in sessions]) * 1000
+    rss = current_rss_mb()
+    return {
+        'sessions': n_sessions,
+        'reruns': len(latencies),
+        'errors': sum(s.errors for s in sessions),
+        'seconds': elapsed,
+        'reruns_per_s': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'rss_mb': rss,
+        'rss_per_session_mb': rss / n_sessions,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for streamlit_app2.py")
+    parser.add_argument('--sessions', type=int, nargs='+', default=SESSIONS)
+    parser.add_argument('--interactions', type=int, default=20)
+    parser.add_argument('--customers', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='FILE', help="also write the results to FILE")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        os.environ['INNBUCKS_CUSTOMERS'] = str(args.customers)
+        print(json.dumps(measure(args.child, args.interactions, args.seed)))
+        return 0
+
+    columns = ['sessions', 'reruns', 'errors', 'reruns_per_s', 'p50_ms', 'p95_ms', 'p99_ms',
+               'rss_mb', 'rss_per_session_mb']
+    print(f"{args.customers:,} customers, {args.interactions} interactions per session")
+    print(' '.join(f"{c:>18}" for c in columns))
+    results = []
+    for n_sessions in args.sessions:
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', str(n_sessions), '--interactions', str(args.interactions),
+             '--customers', str(args.customers), '--seed', str(args.seed)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(' '.join(f"{result[c]:>18,.1f}" if isinstance(result[c], float) else f"{result[c]:>18,}"
+                       for c in columns))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'customers': args.customers, 'interactions': args.interactions, 'results': results}, f,
+                      indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
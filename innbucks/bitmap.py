@@ -0,0 +1,81 @@
+# innbucks/bitmap.py
+import numpy as np
+import pandas as pd
+
+# Set bits per byte value, for counting rows in a packed bitset
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype='int64')
+
+
+# One packed bitset (np.packbits, 1 bit per row) per value of each indexed
+# categorical column. A filter combination is resolved by OR-ing the bitsets
+# of the selected values within a column and AND-ing across columns, which
+# touches n/8 bytes per value and never copies the frame.
+#
+# Bitsets refer to row positions, so the index must be rebuilt if the frame
+# is reordered.
+class BitmapIndex:
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self._bitmaps = {}
+        for col in columns:
+            values = df[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            codes = values.cat.codes.to_numpy()
+            self._bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(values.cat.categories)
+            }
+
+    @property
+    def columns(self):
+        return list(self._bitmaps)
+
+    def values(self, column):
+        return list(self._bitmaps[column])
+
+    # Packed bitset of rows matching `filters`: {column: value or list of
+    # values}. A None or empty selection leaves that column unconstrained;
+    # returns None when nothing is constrained (every row matches).
+    def select(self, filters):
+        result = None
+        for col, selected in filters.items():
+            if selected is None:
+                continue
+            if isinstance(selected, str) or not hasattr(selected, '__iter__'):
+                selected = [selected]
+            selected = list(selected)
+            if not selected:
+                continue
+            bitmaps = self._bitmaps[col]
+            empty = np.zeros((self.n_rows + 7) // 8, dtype='uint8')
+            column_bits = empty
+            for value in selected:
+                column_bits = column_bits | bitmaps.get(value, empty)
+            result = column_bits if result is None else result & column_bits
+        return result
+
+    # Boolean mask of rows [lo, hi) in `bitset` (None means every row)
+    def mask(self, bitset, lo=0, hi=None):
+        hi = self.n_rows if hi is None else hi
+        if bitset is None:
+            return np.ones(max(hi - lo, 0), dtype=bool)
+        byte_lo = lo // 8
+        bits = np.unpackbits(bitset[byte_lo:(hi + 7) // 8])
+        return bits[lo - byte_lo * 8:hi - byte_lo * 8].astype(bool)
+
+    # Ascending row positions in `bitset` within [lo, hi)
+    def positions(self, bitset, lo=0, hi=None):
+        return lo + np.flatnonzero(self.mask(bitset, lo, hi))
+
+    # Number of rows in `bitset` within [lo, hi): whole bytes are counted
+    # through the popcount table, only the partial bytes at the edges are
+    # unpacked
+    def count(self, bitset, lo=0, hi=None):
+        hi = self.n_rows if hi is None else hi
+        if bitset is None:
+            return max(hi - lo, 0)
+        byte_lo, byte_hi = -(-lo // 8), hi // 8
+        if byte_lo >= byte_hi:
+            return int(self.mask(bitset, lo, hi).sum())
+        edges = self.mask(bitset, lo, byte_lo * 8).sum() + self.mask(bitset, byte_hi * 8, hi).sum()
+        return int(_POPCOUNT[bitset[byte_lo:byte_hi]].sum() + edges)
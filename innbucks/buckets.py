@@ -0,0 +1,62 @@
+# innbucks/buckets.py
+#
+# Day, week and month buckets for the trend charts. Days are datetime64[D]
+# (integer days since the epoch), so a bucket is found by flooring with
+# integer arithmetic: weeks start on Monday, months on the 1st. The day ->
+# bucket maps are built once per date range and shared; changing the
+# granularity only re-aggregates the per-day totals through them.
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+GRANULARITIES = ['Day', 'Week', 'Month']
+
+
+# First day of the bucket holding each of `days` (datetime64[D])
+def floor_days(days, granularity):
+    days = np.asarray(days, dtype='datetime64[D]')
+    if granularity == 'Day':
+        return days
+    if granularity == 'Week':
+        # The epoch (1970-01-01) was a Thursday, 3 days after a Monday
+        return days - (days.astype('int64') + 3) % 7
+    if granularity == 'Month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Unknown granularity {granularity!r}; expected one of {', '.join(GRANULARITIES)}")
+
+
+# Bucket code and bucket start date for every day in [first_day, last_day]
+class DateBuckets:
+    def __init__(self, first_day, last_day):
+        self.first_day = np.datetime64(first_day, 'D')
+        days = np.arange(self.first_day, np.datetime64(last_day, 'D') + 1)
+        self._codes, self._starts = {}, {}
+        for granularity in GRANULARITIES:
+            starts, codes = np.unique(floor_days(days, granularity), return_inverse=True)
+            self._codes[granularity] = codes
+            self._starts[granularity] = starts
+
+    # Re-aggregate per-day totals (PanelResults.daily_totals: an
+    # amount_usd and a count column indexed by date) into buckets, summing both
+    # columns in one bincount pass each. Amounts are summed in whole cents.
+    def totals(self, daily_totals, granularity='Day'):
+        codes, starts = self._codes[granularity], self._starts[granularity]
+        day = (daily_totals.index.to_numpy().astype('datetime64[D]') - self.first_day).astype('int64')
+        bucket = codes[day]
+        cents = np.rint(daily_totals['amount_usd'].to_numpy() * 100)
+        amount = np.rint(np.bincount(bucket, weights=cents, minlength=len(starts))).astype('int64')
+        count = np.rint(
+            np.bincount(bucket, weights=daily_totals['count'].to_numpy(), minlength=len(starts))
+        ).astype('int64')
+        present = np.bincount(bucket, minlength=len(starts)) > 0
+        return pd.DataFrame(
+            {'amount_usd': amount[present] / 100, 'count': count[present]},
+            index=pd.Index(starts[present].astype('datetime64[us]'), name='date'),
+        )
+
+
+# Shared DateBuckets per date range (built once per dataset in practice)
+@lru_cache(maxsize=16)
+def date_buckets(first_day, last_day):
+    return DateBuckets(first_day, last_day)
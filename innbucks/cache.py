@@ -0,0 +1,122 @@
+# innbucks/cache.py
+import threading
+import time
+from collections import namedtuple
+
+from innbucks.bitmap import BitmapIndex
+from innbucks.cube import build_customer_cube, build_daily_cube, cube_kpis
+from innbucks.prefix import DailyPrefixSums
+from innbucks.sources import open_source
+from innbucks.store import TransactionStore
+from innbucks.summary import AccountSummary
+from innbucks.table import SortOrders
+from innbucks.weekly import WeeklyAggregates
+
+# Categorical columns the Customer Data filters select on
+CUSTOMER_INDEX_COLUMNS = ['region', 'customer_type', 'kyc_status']
+
+# Everything the dashboard renders from, built once per parameter set. The
+# frames use the compact layout of innbucks.compact; `ids` formats their keys.
+# transactions_df is sorted by transaction_date (see innbucks.store).
+Dataset = namedtuple('Dataset', [
+    'customers_df', 'accounts_df', 'transactions_df', 'ids',
+    'store', 'customer_index', 'account_summary', 'sort_orders',
+    'kpis', 'cube', 'customer_cube', 'prefix', 'weekly',
+    'built_at',
+])
+
+
+# Build the three DataFrames and their KPIs for one parameter set. `source`
+# is a data source URI (see innbucks.sources); the generation parameters only
+# apply to the synthetic source (`workers` only sets how many processes
+# generate it, not what is generated; see innbucks.data). `engine` runs the KPI and cube aggregations
+# in 'pandas' or 'polars' (innbucks.lazy); the results are the same.
+def build_dataset(source=None, n_customers=1000, days=30, seed=42, engine='pandas', workers=1):
+    customers_df, accounts_df, transactions_df, ids = open_source(
+        source, n_customers=n_customers, days=days, seed=seed, workers=workers
+    ).load_compact()
+    store = TransactionStore(transactions_df)
+    transactions_df = store.transactions_df
+    customer_index = BitmapIndex(customers_df, CUSTOMER_INDEX_COLUMNS)
+    account_summary = AccountSummary(customers_df, accounts_df)
+    if engine == 'polars':
+        from innbucks.lazy import aggregate
+        kpis, cube, customer_cube = aggregate(customers_df, accounts_df, transactions_df)
+    elif engine == 'pandas':
+        # The KPIs come from the cubes rather than their own scans; the store,
+        # bitmap indexes and weekly aggregates still read the frames themselves
+        cube = build_daily_cube(customers_df, accounts_df, transactions_df)
+        customer_cube = build_customer_cube(customers_df)
+        kpis = cube_kpis(cube, customer_cube, customers_df, accounts_df)
+    else:
+        raise ValueError(f"Unknown aggregation engine {engine!r}; expected pandas or polars")
+    prefix = DailyPrefixSums(cube)
+    weekly = WeeklyAggregates(accounts_df, transactions_df)
+    # Column sort orders for the paged tables, filled in as columns are sorted on
+    sort_orders = {
+        'customers': SortOrders(customers_df),
+        'transactions': SortOrders(transactions_df),
+        'account_summary': SortOrders(account_summary.frame),
+    }
+    return Dataset(
+        customers_df, accounts_df, transactions_df, ids,
+        store, customer_index, account_summary, sort_orders,
+        kpis, cube, customer_cube, prefix, weekly,
+        time.time(),
+    )
+
+
+# Process-wide cache of datasets keyed on their generation parameters.
+#
+# Entries are shared by every session, so callers must treat the returned
+# frames as read-only. Entries older than `ttl` seconds are rebuilt on the
+# next request; concurrent requests for the same key wait for a single build.
+class DatasetCache:
+    def __init__(self, builder=build_dataset, ttl=None, clock=time.monotonic):
+        self._builder = builder
+        self._clock = clock
+        self.ttl = ttl
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, entry):
+        return entry is not None and (self.ttl is None or self._clock() - entry[1] < self.ttl)
+
+    def get(self, **params):
+        key = tuple(sorted(params.items()))
+        entry = self._entries.get(key)
+        if self._fresh(entry):
+            with self._lock:
+                self.hits += 1
+            return entry[0]
+
+        with self._key_lock(key):
+            # Another session may have finished the build while we waited
+            entry = self._entries.get(key)
+            if self._fresh(entry):
+                with self._lock:
+                    self.hits += 1
+                return entry[0]
+            with self._lock:
+                self.misses += 1
+            value = self._builder(**params)
+            self._entries[key] = (value, self._clock())
+            return value
+
+    def invalidate(self, **params):
+        with self._lock:
+            if params:
+                self._entries.pop(tuple(sorted(params.items())), None)
+            else:
+                self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,160 @@
+# innbucks/compact.py
+#
+# Compact columnar layout of the three dashboard tables:
+#
+#   customers     customer_key int32, enumerations as category
+#   accounts      account_key int32, customer_key int32, balance_cents int64
+#   transactions  transaction_key int64, account_key int32, amount_cents int64
+#
+# Customer and account keys are row positions into their own table, so joins
+# are array lookups. transaction_key identifies a transaction independently of
+# its position (the dashboard keeps transactions sorted by date).
+# The formatted ids ('INN0001', 'ACCINN0001', 'TXNACCINN00011') are only
+# produced at display time through the dataset's id codec.
+import numpy as np
+import pandas as pd
+
+ENUM_COLUMNS = {
+    'customers': ['customer_type', 'region', 'branch', 'mobile_network', 'kyc_status'],
+    'accounts': ['account_status'],
+    'transactions': ['transaction_type', 'channel', 'status'],
+}
+
+# Compact column -> display column
+KEY_COLUMNS = {
+    'customer_key': 'customer_id',
+    'account_key': 'account_id',
+    'transaction_key': 'transaction_id',
+}
+CENTS_COLUMNS = {
+    'balance_cents': 'usd_balance',
+    'amount_cents': 'amount_usd',
+}
+
+
+# Round dollar amounts to whole cents
+def to_cents(amounts):
+    return np.rint(np.asarray(amounts, dtype='float64') * 100).astype('int64')
+
+
+# Format integers as prefix + zero-padded number. Large batches drawn from a
+# small range are formatted once per distinct value and then gathered.
+def _format_ids(prefix, numbers, width=0):
+    numbers = np.asarray(numbers, dtype='int64')
+    top = int(numbers.max(initial=0))
+    if len(numbers) > 2 * (top + 1):
+        table = _format_ids(prefix, np.arange(top + 1), width)
+        return pd.Series(table.array.take(numbers))
+    labels = pd.Series(numbers).astype(str)
+    if width:
+        labels = labels.str.zfill(width)
+    return prefix + labels
+
+
+# Ids of synthetic data are a pure function of the keys: customer n is
+# INN{n:04d}, its account ACC + customer id, and transaction i of that
+# account TXN + account id + i. Only the per-account transaction offsets
+# are kept. A codec for one shard of the data covers the accounts from
+# `first_account` and the transactions from `first_transaction`, with
+# offsets relative to the latter.
+class SyntheticIds:
+    def __init__(self, account_offsets, first_account=0, first_transaction=0):
+        self.account_offsets = np.asarray(account_offsets, dtype='int64')
+        self.first_account = first_account
+        self.first_transaction = first_transaction
+
+    def customer_ids(self, customer_keys):
+        return _format_ids('INN', np.asarray(customer_keys, dtype='int64') + 1, width=4)
+
+    def account_ids(self, account_keys):
+        return _format_ids('ACCINN', np.asarray(account_keys, dtype='int64') + 1, width=4)
+
+    def transaction_ids(self, transaction_keys):
+        keys = np.asarray(transaction_keys, dtype='int64') - self.first_transaction
+        owner = np.searchsorted(self.account_offsets, keys, side='right') - 1
+        return 'TXN' + self.account_ids(owner + self.first_account) + _format_ids('', keys - self.account_offsets[owner])
+
+
+# Ids loaded from a real export are kept once, in key order
+class LabelIds:
+    def __init__(self, customer_ids, account_ids, transaction_ids):
+        self._customer_ids = pd.array(customer_ids, dtype='str')
+        self._account_ids = pd.array(account_ids, dtype='str')
+        self._transaction_ids = pd.array(transaction_ids, dtype='str')
+
+    @staticmethod
+    def _take(labels, keys):
+        return pd.Series(labels.take(np.asarray(keys, dtype='int64'), allow_fill=True))
+
+    def customer_ids(self, customer_keys):
+        return self._take(self._customer_ids, customer_keys)
+
+    def account_ids(self, account_keys):
+        return self._take(self._account_ids, account_keys)
+
+    def transaction_ids(self, transaction_keys):
+        return self._take(self._transaction_ids, transaction_keys)
+
+
+# Positions of `ids` in `labels`, -1 where an id is unknown
+def _positions(labels, ids, table, column):
+    index = pd.Index(labels)
+    if not index.is_unique:
+        raise ValueError(f"{table}.{column} is not unique")
+    return index.get_indexer(ids)
+
+
+# Convert string-keyed frames (as returned by a data source) to the compact layout
+def compact_frames(customers_df, accounts_df, transactions_df):
+    customer_ids = customers_df['customer_id'].to_numpy()
+    account_ids = accounts_df['account_id'].to_numpy()
+
+    customers = {'customer_key': np.arange(len(customers_df), dtype='int32')}
+    for col in ENUM_COLUMNS['customers']:
+        customers[col] = customers_df[col].astype('category').array
+
+    accounts = {
+        'customer_key': _positions(customer_ids, accounts_df['customer_id'], 'customers', 'customer_id').astype('int32'),
+        'account_key': np.arange(len(accounts_df), dtype='int32'),
+        'balance_cents': to_cents(accounts_df['usd_balance']),
+        'account_status': accounts_df['account_status'].astype('category').array,
+    }
+
+    transactions = {
+        'transaction_key': np.arange(len(transactions_df), dtype='int64'),
+        'account_key': _positions(account_ids, transactions_df['account_id'], 'accounts', 'account_id').astype('int32'),
+        'transaction_date': transactions_df['transaction_date'].to_numpy(),
+        'amount_cents': to_cents(transactions_df['amount_usd']),
+    }
+    for col in ENUM_COLUMNS['transactions']:
+        transactions[col] = transactions_df[col].astype('category').array
+
+    ids = LabelIds(customer_ids, account_ids, transactions_df['transaction_id'].to_numpy())
+    return pd.DataFrame(customers), pd.DataFrame(accounts), pd.DataFrame(transactions), ids
+
+
+# Format one compact frame for display: keys become ids and cents become dollars
+def expand_frame(df, ids):
+    formatters = {
+        'customer_key': ids.customer_ids,
+        'account_key': ids.account_ids,
+        'transaction_key': ids.transaction_ids,
+    }
+    columns = {}
+    for col in df.columns:
+        if col in KEY_COLUMNS:
+            columns[KEY_COLUMNS[col]] = formatters[col](df[col]).set_axis(df.index)
+        elif col in CENTS_COLUMNS:
+            columns[CENTS_COLUMNS[col]] = df[col] / 100
+        else:
+            columns[col] = df[col]
+    return pd.DataFrame(columns, index=df.index)
+
+
+# Deep memory footprint of a set of frames, in bytes per column
+def memory_by_column(frames):
+    usage = {}
+    for name, df in frames.items():
+        for col, nbytes in df.memory_usage(deep=True, index=False).items():
+            usage[f'{name}.{col}'] = int(nbytes)
+    return usage
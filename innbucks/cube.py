@@ -0,0 +1,224 @@
+# innbucks/cube.py
+#
+# Materialized rollups the dashboard panels read from instead of scanning the
+# raw frames. Both are built in a single grouped pass when a dataset is
+# loaded; every panel afterwards costs O(number of groups).
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['date', 'transaction_type', 'channel', 'region', 'customer_type']
+CUSTOMER_DIMENSIONS = ['region', 'customer_type', 'mobile_network', 'kyc_status']
+
+# Label for transactions whose account or customer is missing from the export
+UNKNOWN = 'Unknown'
+
+
+# Integer codes and labels for one dimension. The last label is UNKNOWN,
+# used for missing values and for `positions` (row positions into `values`)
+# that are -1.
+def _codes(values, positions=None):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, labels = pd.factorize(values)
+    codes = codes.astype('int64')
+    labels = np.append(np.asarray(labels, dtype=object), UNKNOWN)
+    if positions is not None:
+        codes = np.where(positions >= 0, codes[positions], -1)
+    return np.where(codes >= 0, codes, len(labels) - 1), labels
+
+
+# Daily cube over the compact frames: date x transaction_type x channel x
+# region x customer_type, holding the transaction count and amount_cents.
+#
+# Each dimension is reduced to integer codes (category codes where available),
+# the codes are combined into one mixed-radix cell number and count/sum come
+# from a single np.bincount.
+def build_daily_cube(customers_df, accounts_df, transactions_df):
+    account_customer = accounts_df['customer_key'].to_numpy()
+    txn_account = transactions_df['account_key'].to_numpy()
+    txn_customer = np.where(txn_account >= 0, account_customer[txn_account], -1)
+
+    days = transactions_df['transaction_date'].to_numpy().astype('datetime64[D]')
+    first_day = days.min() if len(days) else np.datetime64('1970-01-01', 'D')
+    day_codes = (days - first_day).astype('int64')
+    n_days = int(day_codes.max(initial=-1)) + 1
+
+    dimensions = [
+        (day_codes, (first_day + np.arange(n_days)).astype('datetime64[us]')),
+        _codes(transactions_df['transaction_type']),
+        _codes(transactions_df['channel']),
+        _codes(customers_df['region'], txn_customer),
+        _codes(customers_df['customer_type'], txn_customer),
+    ]
+
+    cell, n_cells = _cells(dimensions)
+    counts = np.bincount(cell, minlength=n_cells)
+    volume = np.bincount(cell, weights=transactions_df['amount_cents'].to_numpy(), minlength=n_cells)
+    occupied = np.flatnonzero(counts)
+
+    cube = _unpack(occupied, CUBE_DIMENSIONS, dimensions)
+    cube['count'] = counts[occupied]
+    cube['amount_cents'] = np.rint(volume[occupied]).astype('int64')
+    return cube
+
+
+# Mixed-radix cell number of each row, and the number of cells, for a list of
+# (codes, labels) dimensions (the first is the most significant)
+def _cells(dimensions):
+    cell = np.zeros(len(dimensions[0][0]), dtype='int64')
+    for codes, labels in dimensions:
+        cell = cell * len(labels) + codes
+    return cell, int(np.prod([len(labels) for _, labels in dimensions]))
+
+
+# Unpack cell numbers back into one label column per dimension
+def _unpack(cells, names, dimensions):
+    columns = {}
+    remainder = cells
+    for name, (_, labels) in reversed(list(zip(names, dimensions))):
+        remainder, codes = np.divmod(remainder, len(labels))
+        columns[name] = labels[codes]
+    return pd.DataFrame({name: columns[name] for name in names})
+
+
+# Customer cube: region x customer_type x mobile_network x kyc_status ->
+# customers, in one bincount over the category codes. A missing value gets a
+# code of its own, so, like groupby(observed=True, dropna=False).size(), a
+# customer missing one dimension still counts towards the others: each panel
+# drops only the customers missing its own column. The dimensions stay
+# categorical, missing values as NaN.
+def build_customer_cube(customers_df):
+    columns = [customers_df[col].astype('category') for col in CUSTOMER_DIMENSIONS]
+    dimensions = []
+    for col in columns:
+        codes = col.cat.codes.to_numpy().astype('int64')
+        n_labels = len(col.cat.categories)
+        dimensions.append((np.where(codes >= 0, codes, n_labels), np.arange(n_labels + 1)))
+
+    cell, n_cells = _cells(dimensions)
+    counts = np.bincount(cell, minlength=n_cells)
+    occupied = np.flatnonzero(counts)
+
+    cube = _unpack(occupied, CUSTOMER_DIMENSIONS, dimensions)
+    for name, col in zip(CUSTOMER_DIMENSIONS, columns):
+        codes = cube[name].to_numpy()
+        codes = np.where(codes < len(col.cat.categories), codes, -1)
+        cube[name] = pd.Categorical.from_codes(codes, dtype=col.dtype)
+    cube['count'] = counts[occupied]
+    return cube
+
+
+# Rows of the daily cube for days in [start, end). Cells are laid out with the
+# date as the most significant dimension, so the cube is sorted by date and
+# the window is found by binary search.
+def cube_window(cube, start=None, end=None):
+    dates = cube['date'].to_numpy()
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left'))
+    hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='left'))
+    return cube.iloc[lo:max(lo, hi)]
+
+
+# Every number the analytics panels show, as the rendering code consumes it.
+# Count series are named 'count' and volume series 'amount_usd', each indexed
+# by its dimension and largest first (like Series.value_counts()), ties in
+# group order; daily_totals holds amount_usd and count per date.
+class PanelResults(NamedTuple):
+    transaction_types: pd.Series
+    volume_by_type: pd.Series
+    channel_usage: pd.Series
+    regional_dist: pd.Series
+    customer_types: pd.Series
+    network_dist: pd.Series
+    daily_totals: pd.DataFrame
+
+
+# Group codes and labels of a cube column: category codes where the column is
+# categorical, sorted factorization otherwise (the order groupby uses)
+def _group_codes(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype('int64'), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype('int64'), labels
+
+
+# Per-group totals of `weights` (None counts rows), as a series largest
+# first; groups that never occur are left out, as with observed=True, and so
+# are rows with a missing value, as with value_counts()
+def _grouped(values, weights, name, scale=1):
+    codes, labels = _group_codes(values)
+    known = codes >= 0
+    if not known.all():
+        codes = codes[known]
+        weights = None if weights is None else weights[known]
+    totals = np.bincount(codes, weights=weights, minlength=len(labels))
+    present = np.bincount(codes, minlength=len(labels)) > 0
+    if weights is not None:
+        totals = np.rint(totals).astype('int64')
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        index = pd.CategoricalIndex(pd.Categorical.from_codes(np.flatnonzero(present), dtype=values.dtype))
+    else:
+        index = pd.Index(labels[present])
+    totals = totals[present] / scale if scale != 1 else totals[present]
+    series = pd.Series(totals, index=index.rename(values.name), name=name)
+    return series.sort_values(ascending=False, kind='stable')
+
+
+# All panel numbers from one pass over each cube: every series is a bincount
+# over the integer codes of one cube column
+def aggregate_panels(cube, customer_cube):
+    counts = cube['count'].to_numpy()
+    cents = cube['amount_cents'].to_numpy()
+    customers = customer_cube['count'].to_numpy()
+
+    day_codes, days = _group_codes(cube['date'])
+    daily_cents = np.rint(np.bincount(day_codes, weights=cents, minlength=len(days))).astype('int64')
+    daily = pd.DataFrame(
+        {
+            'amount_usd': daily_cents / 100,
+            'count': np.rint(np.bincount(day_codes, weights=counts, minlength=len(days))).astype('int64'),
+        },
+        index=pd.Index(days, name='date'),
+    )
+
+    return PanelResults(
+        transaction_types=_grouped(cube['transaction_type'], counts, 'count'),
+        volume_by_type=_grouped(cube['transaction_type'], cents, 'amount_usd', scale=100),
+        channel_usage=_grouped(cube['channel'], counts, 'count'),
+        regional_dist=_grouped(customer_cube['region'], customers, 'count'),
+        customer_types=_grouped(customer_cube['customer_type'], customers, 'count'),
+        network_dist=_grouped(customer_cube['mobile_network'], customers, 'count'),
+        daily_totals=daily,
+    )
+
+
+# calculate_kpis() output from the cubes, without another pass over the
+# transactions or customers (only the account balances are summed). As
+# there, the KYC rate is over every customer, a missing status counting as
+# not verified.
+def cube_kpis(cube, customer_cube, customers_df, accounts_df):
+    n_transactions = int(cube['count'].sum())
+    cents = int(cube['amount_cents'].sum())
+    n_customers = len(customers_df)
+    verified = customer_cube.loc[customer_cube['kyc_status'] == 'Verified', 'count'].sum()
+    return {
+        'total_customers': n_customers,
+        'total_transactions': n_transactions,
+        'total_volume': cents / 100,
+        'total_deposits': accounts_df['balance_cents'].sum() / 100,
+        'kyc_completion_rate': verified / n_customers if n_customers else float('nan'),
+        'avg_transaction_size': cents / n_transactions / 100 if n_transactions else float('nan'),
+    }
+
+
+# The panel numbers over the in-memory cubes. innbucks.duck.DuckDBQueries
+# answers results() from Parquet files instead.
+class CubePanels:
+    def __init__(self, cube, customer_cube):
+        self.cube = cube
+        self.customer_cube = customer_cube
+
+    def results(self):
+        return aggregate_panels(self.cube, self.customer_cube)
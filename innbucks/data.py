@@ -0,0 +1,201 @@
+# innbucks/data.py
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from innbucks.compact import SyntheticIds, expand_frame, to_cents
+
+# Zimbabwe-specific reference data
+CUSTOMER_TYPES = ['Individual', 'Agent', 'Merchant']
+CUSTOMER_TYPE_P = [0.85, 0.1, 0.05]
+REGIONS = ['Harare', 'Bulawayo', 'Midlands', 'Masvingo']
+BRANCHES = ['Harare CBD', 'Bulawayo Central', 'Mutare', 'Gweru']
+MOBILE_NETWORKS = ['Econet', 'NetOne', 'Telecel']
+MOBILE_NETWORK_P = [0.7, 0.2, 0.1]
+KYC_STATUSES = ['Verified', 'Pending']
+KYC_STATUS_P = [0.8, 0.2]
+TRANSACTION_TYPES = ['Send Money', 'Cash In', 'Cash Out', 'Bill Payment', 'Airtime']
+TRANSACTION_TYPE_P = [0.4, 0.2, 0.15, 0.15, 0.1]
+CHANNELS = ['Mobile App', 'USSD', 'Agent']
+CHANNEL_P = [0.6, 0.3, 0.1]
+
+TRANSACTIONS_PER_ACCOUNT = 15
+
+
+# Customers per generation shard. Shards are fixed by n_customers alone, and
+# each draws from its own stream spawned from the seed, so the output does
+# not depend on how many worker processes generate them.
+SHARD_CUSTOMERS = 100_000
+
+
+# Draw one categorical column as positions into `values`
+def _choice_codes(rng, values, size, p=None):
+    if p is None:
+        return rng.integers(0, len(values), size, dtype='int8')
+    codes = np.searchsorted(np.cumsum(p), rng.random(size), side='right').clip(max=len(values) - 1)
+    return codes.astype('int8')
+
+
+# Categorical column over `values` from codes drawn by _choice_codes
+def _categorical(codes, values):
+    return pd.Categorical.from_codes(codes, categories=values)
+
+
+# A categorical column holding one value
+def _constant(value, size):
+    return pd.Categorical.from_codes(np.zeros(size, dtype='int8'), categories=[value])
+
+
+# Customers in each shard of `n_customers`, `shard_customers` at a time
+def shard_sizes(n_customers, shard_customers=SHARD_CUSTOMERS):
+    return [min(shard_customers, n_customers - lo) for lo in range(0, n_customers, shard_customers)] or [0]
+
+
+# Raw columns of one shard of `n_customers` customers, drawn from the
+# shard's own SeedSequence. Columns come back as plain arrays (category
+# codes, cents, seconds since start) so they are cheap to send back from a
+# worker process.
+def generate_shard(seed_sequence, n_customers, days, transactions_per_account=TRANSACTIONS_PER_ACCOUNT):
+    rng = np.random.default_rng(seed_sequence)
+    shard = {
+        'customer_type': _choice_codes(rng, CUSTOMER_TYPES, n_customers, CUSTOMER_TYPE_P),
+        'region': _choice_codes(rng, REGIONS, n_customers),
+        'branch': _choice_codes(rng, BRANCHES, n_customers),
+        'mobile_network': _choice_codes(rng, MOBILE_NETWORKS, n_customers, MOBILE_NETWORK_P),
+        'kyc_status': _choice_codes(rng, KYC_STATUSES, n_customers, KYC_STATUS_P),
+        'balance_cents': to_cents(np.maximum(10, rng.lognormal(5, 1.2, n_customers))),
+    }
+
+    counts = rng.poisson(transactions_per_account, n_customers)
+    n_transactions = int(counts.sum())
+    day_offset = rng.integers(0, days, n_transactions, dtype='int64')
+    hour_offset = rng.integers(0, 24, n_transactions, dtype='int64')
+    shard.update({
+        'counts': counts,
+        'seconds': day_offset * 86400 + hour_offset * 3600,
+        'amount_cents': to_cents(np.abs(rng.lognormal(3.5, 1.0, n_transactions))),
+        'transaction_type': _choice_codes(rng, TRANSACTION_TYPES, n_transactions, TRANSACTION_TYPE_P),
+        'channel': _choice_codes(rng, CHANNELS, n_transactions, CHANNEL_P),
+    })
+    return shard
+
+
+# Generate every shard, in a pool of `workers` processes when there is more
+# than one shard to share out, and concatenate their columns in shard order.
+# Spawned workers re-import the caller's __main__, so workers > 1 is only for
+# entry points guarded by `if __name__ == '__main__'` (python -m
+# innbucks.snapshot, the benchmarks), never the Streamlit script.
+def _generate_shards(n_customers, days, seed, workers=1):
+    sizes = shard_sizes(n_customers)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (streams, sizes, [days] * len(sizes))
+    if workers is not None and workers <= 1 or len(sizes) == 1:
+        shards = list(map(generate_shard, *args))
+    else:
+        # spawn rather than fork: the dashboard server is multi-threaded
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            shards = list(pool.map(generate_shard, *args))
+    return {col: np.concatenate([shard[col] for shard in shards]) for col in shards[0]}
+
+
+# The compact frames and id codec for shard columns from generate_shard().
+# Keys start at `first_customer` / `first_transaction`, so a shard written on
+# its own gets the keys (and ids) it has in the whole dataset.
+def compact_shard(columns, start_date, first_customer=0, first_transaction=0):
+    counts = columns['counts']
+    n_customers = len(counts)
+    n_transactions = int(counts.sum())
+
+    # Customer data
+    customer_keys = np.arange(first_customer, first_customer + n_customers, dtype='int32')
+
+    customers_df = pd.DataFrame({
+        'customer_key': customer_keys,
+        'customer_type': _categorical(columns['customer_type'], CUSTOMER_TYPES),
+        'region': _categorical(columns['region'], REGIONS),
+        'branch': _categorical(columns['branch'], BRANCHES),
+        'mobile_network': _categorical(columns['mobile_network'], MOBILE_NETWORKS),
+        'kyc_status': _categorical(columns['kyc_status'], KYC_STATUSES),
+    })
+
+    # Account data (one wallet per customer)
+    accounts_df = pd.DataFrame({
+        'customer_key': customer_keys,
+        'account_key': customer_keys,
+        'balance_cents': columns['balance_cents'],
+        'account_status': _constant('Active', n_customers),
+    })
+
+    # Transaction data
+    offsets = np.cumsum(counts) - counts
+    transaction_date = pd.Timestamp(start_date) + pd.to_timedelta(columns['seconds'], unit='s')
+
+    transactions_df = pd.DataFrame({
+        'transaction_key': np.arange(first_transaction, first_transaction + n_transactions, dtype='int64'),
+        'account_key': np.repeat(customer_keys, counts),
+        'transaction_date': transaction_date,
+        'amount_cents': columns['amount_cents'],
+        'transaction_type': _categorical(columns['transaction_type'], TRANSACTION_TYPES),
+        'channel': _categorical(columns['channel'], CHANNELS),
+        'status': _constant('Completed', n_transactions),
+    })
+
+    ids = SyntheticIds(offsets, first_account=first_customer, first_transaction=first_transaction)
+    return customers_df, accounts_df, transactions_df, ids
+
+
+# Generate synthetic data for InnBucks Zimbabwe in the compact layout of
+# innbucks.compact, together with the id codec that formats its keys.
+#
+# Every column is drawn as a whole array per shard: transaction counts per
+# account come from one Poisson draw, owners are laid out with np.repeat and
+# transaction keys run in account order, so ids can be recovered from the
+# offsets. `workers` processes generate the shards (None: one per CPU); the
+# result is identical for any number of workers.
+def generate_compact_data(n_customers=1000, days=30, seed=42, start_date=None, workers=1):
+    if start_date is None:
+        start_date = datetime.datetime.now() - timedelta(days=days)
+    return compact_shard(_generate_shards(n_customers, days, seed, workers), start_date)
+
+
+# One compact frame with formatted string ids, dollar amounts and string
+# enumerations (missing values stay missing), the layout data sources return
+def string_frame(df, ids):
+    df = expand_frame(df, ids)
+    for col in df.select_dtypes('category').columns:
+        values = df[col].array
+        df[col] = pd.array(values.categories, dtype='str').take(values.codes, allow_fill=True)
+    return df
+
+
+# Generate synthetic data for InnBucks Zimbabwe with formatted string ids,
+# dollar amounts and string enumerations
+def generate_innbucks_data(n_customers=1000, days=30, seed=42, start_date=None, workers=1):
+    customers_df, accounts_df, transactions_df, ids = generate_compact_data(
+        n_customers=n_customers, days=days, seed=seed, start_date=start_date, workers=workers
+    )
+    return tuple(string_frame(df, ids) for df in (customers_df, accounts_df, transactions_df))
+
+
+# Calculate KPIs from the compact frames
+def calculate_kpis(customers_df, accounts_df, transactions_df):
+    total_customers = customers_df['customer_key'].nunique()
+    total_transactions = len(transactions_df)
+    total_volume = transactions_df['amount_cents'].sum() / 100
+    total_deposits = accounts_df['balance_cents'].sum() / 100
+    kyc_completion_rate = (customers_df['kyc_status'] == 'Verified').mean()
+    avg_transaction_size = transactions_df['amount_cents'].mean() / 100
+
+    return {
+        'total_customers': total_customers,
+        'total_transactions': total_transactions,
+        'total_volume': total_volume,
+        'total_deposits': total_deposits,
+        'kyc_completion_rate': kyc_completion_rate,
+        'avg_transaction_size': avg_transaction_size,
+    }
@@ -0,0 +1,69 @@
+# innbucks/downsample.py
+#
+# Server-side downsampling for line charts, so a long history sends at most
+# a fixed number of points per series to the browser while keeping its
+# shape and peaks.
+#
+#   lttb     Largest-Triangle-Three-Buckets: keeps, per bucket, the point
+#            forming the largest triangle with the previously kept point and
+#            the next bucket's average. Follows the visual shape closely.
+#   minmax   keeps the minimum and maximum of each bucket, so every peak and
+#            trough survives exactly.
+import numpy as np
+import pandas as pd
+
+METHODS = ['lttb', 'minmax']
+
+
+# Positions of the points LTTB keeps out of (x, y), first and last included
+def lttb_positions(x, y, n_out):
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+
+    # Bucket edges over the interior points 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    kept = np.empty(n_out, dtype='int64')
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the last bucket)
+        next_lo, next_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+# Positions of each bucket's minimum and maximum, in order
+def minmax_positions(y, n_out):
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(0, n, n_out // 2 + 1).astype('int64')
+    kept = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            kept.extend([lo + int(np.argmin(y[lo:hi])), lo + int(np.argmax(y[lo:hi]))])
+    return np.unique(kept)
+
+
+# At most `max_points` points of a series indexed by time (or any numeric
+# index), or the series itself when it already fits
+def downsample(series, max_points, method='lttb'):
+    if max_points is None or len(series) <= max_points:
+        return series
+    if method == 'lttb':
+        index = series.index
+        x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(series))
+        positions = lttb_positions(x, series.to_numpy(), max_points)
+    elif method == 'minmax':
+        positions = minmax_positions(series.to_numpy(), max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {', '.join(METHODS)}")
+    return series.iloc[positions]
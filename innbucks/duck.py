@@ -0,0 +1,317 @@
+# innbucks/duck.py
+#
+# Optional DuckDB query engine over a Parquet export (the layout ParquetSource
+# reads: one file or partitioned directory per table). Nothing is loaded into
+# pandas up front: each panel, table page and KPI is a SQL query over the
+# Parquet files, so DuckDB pushes the date window and filters down to the
+# row groups, reads only the projected columns, and hands back only the small
+# result frame.
+#
+# DuckDBQueries answers the panel numbers through the same interface as
+# innbucks.cube.CubePanels (results), from one query per panel.
+import copy
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from innbucks.cube import UNKNOWN, PanelResults
+from innbucks.sources import SCHEMA, TABLES, SchemaError
+
+# Transaction dimensions that come from the account's customer
+CUSTOMER_JOIN_COLUMNS = ['region', 'customer_type']
+
+# Denormalized account + customer view behind the Account Summary tab
+ACCOUNT_SUMMARY_COLUMNS = ['customer_id', 'account_id', 'usd_balance', 'account_status'] + [
+    col for col in SCHEMA['customers'] if col != 'customer_id'
+]
+
+# SQL type each SCHEMA dtype is read as
+SQL_TYPES = {'str': 'VARCHAR', 'float64': 'DOUBLE', 'datetime64[us]': 'TIMESTAMP'}
+
+# Default sort order breaking ties, per table
+TIEBREAK = {
+    'customers': ['customer_id'],
+    'accounts': ['account_id'],
+    'transactions': ['transaction_id'],
+    'account_summary': ['account_id'],
+}
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+# read_parquet() over a table's file, or every file under its directory
+def _parquet_scan(path, table):
+    directory = os.path.join(path, table)
+    if os.path.isdir(directory):
+        pattern = os.path.join(directory, '**', '*.parquet')
+        return f"read_parquet({_literal(pattern)}, hive_partitioning = true, union_by_name = true)"
+    return f"read_parquet({_literal(os.path.join(path, table + '.parquet'))})"
+
+
+class DuckDBQueries:
+    def __init__(self, path):
+        import duckdb
+
+        self.path = path
+        self.start = self.end = None
+        self.built_at = time.time()
+        self._con = duckdb.connect()
+        try:
+            for table in TABLES:
+                columns = ', '.join(
+                    f"CAST({_quote(col)} AS {SQL_TYPES[dtype]}) AS {_quote(col)}"
+                    for col, dtype in SCHEMA[table].items()
+                )
+                self._con.execute(f"CREATE VIEW {table} AS SELECT {columns} FROM {_parquet_scan(path, table)}")
+            columns = ', '.join(
+                f"{'a' if col in SCHEMA['accounts'] else 'c'}.{_quote(col)}" for col in ACCOUNT_SUMMARY_COLUMNS
+            )
+            self._con.execute(
+                f"CREATE VIEW account_summary AS SELECT {columns} FROM accounts a JOIN customers c USING (customer_id)"
+            )
+        except duckdb.Error as exc:
+            raise SchemaError(f"{path}: {exc}") from exc
+
+    # The same queries restricted to transactions in [start, end)
+    def window(self, start=None, end=None):
+        windowed = copy.copy(self)
+        windowed.start, windowed.end = start, end
+        return windowed
+
+    # Run a query on its own cursor (connections are not shared across
+    # threads). Errors only found while scanning the files, such as a corrupt
+    # Parquet file under a table's directory, are raised as SchemaError.
+    def _execute(self, sql, params=()):
+        import duckdb
+
+        try:
+            return self._con.cursor().execute(sql, list(params))
+        except duckdb.Error as exc:
+            raise SchemaError(f"{self.path}: {exc}") from exc
+
+    def _frame(self, sql, params=()):
+        return self._execute(sql, params).df()
+
+    def _row(self, sql, params=()):
+        return self._execute(sql, params).fetchone()
+
+    def _scalar(self, sql, params=()):
+        return self._row(sql, params)[0]
+
+    # WHERE clause and parameters for `filters` ({column: value or list of
+    # values}, None or empty meaning unconstrained) and, for transactions, the
+    # date window
+    def _where(self, table, filters=None, windowed=False):
+        columns = self.columns(table)
+        clauses, params = [], []
+        for col, selected in (filters or {}).items():
+            if col not in columns:
+                raise KeyError(f"{table} has no column {col!r}")
+            if selected is None or isinstance(selected, str):
+                selected = [] if selected is None else [selected]
+            selected = list(selected)
+            if selected:
+                clauses.append(f"{_quote(col)} IN ({', '.join('?' * len(selected))})")
+                params.extend(selected)
+        if windowed and self.start is not None:
+            clauses.append("transaction_date >= ?")
+            params.append(pd.Timestamp(self.start).to_pydatetime())
+        if windowed and self.end is not None:
+            clauses.append("transaction_date < ?")
+            params.append(pd.Timestamp(self.end).to_pydatetime())
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    # First and last transaction timestamps (over the whole export)
+    def date_bounds(self):
+        first, last = self._row("SELECT min(transaction_date), max(transaction_date) FROM transactions")
+        return (None, None) if first is None else (pd.Timestamp(first), pd.Timestamp(last))
+
+    # calculate_kpis() output, with the transaction KPIs over the window.
+    # Amounts are summed in whole cents, as the in-memory path does, and the
+    # KYC rate is over every customer, a missing status counting as not
+    # verified.
+    def kpis(self):
+        where, params = self._where('transactions', windowed=True)
+        n_transactions, cents = self._row(
+            f"SELECT count(*), sum(round(amount_usd * 100)::BIGINT) FROM transactions{where}", params
+        )
+        n_customers, verified = self._row(
+            "SELECT count(DISTINCT customer_id),"
+            " count(*) FILTER (WHERE kyc_status = 'Verified') / count(*) FROM customers"
+        )
+        deposits = self._scalar("SELECT sum(round(usd_balance * 100)::BIGINT) FROM accounts")
+        return {
+            'total_customers': int(n_customers),
+            'total_transactions': int(n_transactions),
+            'total_volume': (cents or 0) / 100,
+            'total_deposits': (deposits or 0) / 100,
+            'kyc_completion_rate': float('nan') if verified is None else float(verified),
+            'avg_transaction_size': cents / n_transactions / 100 if n_transactions else float('nan'),
+        }
+
+    def count(self, table, filters=None):
+        where, params = self._where(table, filters, windowed=table == 'transactions')
+        return int(self._scalar(f"SELECT count(*) FROM {table}{where}", params))
+
+    # Distinct values of a column, for filter options
+    def values(self, table, column):
+        if column not in self.columns(table):
+            raise KeyError(f"{table} has no column {column!r}")
+        frame = self._frame(f"SELECT DISTINCT {_quote(column)} AS v FROM {table} WHERE v IS NOT NULL ORDER BY v")
+        return frame['v'].tolist()
+
+    # Transactions in the window with `dimension` (joined from their customer
+    # when it is a customer attribute) as a FROM clause; missing values are
+    # UNKNOWN, as in the daily cube
+    def _transactions_by(self, dimension):
+        value = f"coalesce({_quote(dimension)}, {_literal(UNKNOWN)}) AS {_quote(dimension)}"
+        if dimension in CUSTOMER_JOIN_COLUMNS:
+            return (
+                f"(SELECT t.transaction_date, t.amount_usd, {value}"
+                " FROM transactions t LEFT JOIN accounts a USING (account_id)"
+                " LEFT JOIN customers c USING (customer_id))"
+            )
+        if dimension not in SCHEMA['transactions']:
+            raise KeyError(f"transactions have no dimension {dimension!r}")
+        return f"(SELECT transaction_date, amount_usd, {value} FROM transactions)"
+
+    # Series indexed by `dimension`, largest first, like the PanelResults series
+    def _grouped(self, source, dimension, measure, name, params=(), where=''):
+        frame = self._frame(
+            f"SELECT {_quote(dimension)} AS d, {measure} AS m FROM {source}{where} GROUP BY d ORDER BY m DESC, d",
+            params,
+        )
+        return pd.Series(frame['m'].to_numpy(), index=pd.Index(frame['d'], name=dimension), name=name)
+
+    def counts(self, dimension):
+        where, params = self._where('transactions', windowed=True)
+        return self._grouped(self._transactions_by(dimension), dimension, 'count(*)', 'count', params, where)
+
+    def volume(self, dimension):
+        where, params = self._where('transactions', windowed=True)
+        return self._grouped(
+            self._transactions_by(dimension), dimension, 'sum(round(amount_usd * 100)::BIGINT) / 100',
+            'amount_usd', params, where,
+        )
+
+    # Customers per value of `dimension`, leaving out customers missing it
+    # (like value_counts() and the in-memory customer panels)
+    def customer_counts(self, dimension):
+        if dimension not in SCHEMA['customers']:
+            raise KeyError(f"customers have no dimension {dimension!r}")
+        where = f" WHERE {_quote(dimension)} IS NOT NULL"
+        return self._grouped('customers', dimension, 'count(*)', 'count', where=where)
+
+    # Every panel's numbers, as CubePanels.results() returns them
+    def results(self):
+        return PanelResults(
+            transaction_types=self.counts('transaction_type'),
+            volume_by_type=self.volume('transaction_type'),
+            channel_usage=self.counts('channel'),
+            regional_dist=self.customer_counts('region'),
+            customer_types=self.customer_counts('customer_type'),
+            network_dist=self.customer_counts('mobile_network'),
+            daily_totals=self.daily(),
+        )
+
+    # Daily volume (USD) and count, indexed by date, like PanelResults.daily_totals
+    def daily(self):
+        where, params = self._where('transactions', windowed=True)
+        frame = self._frame(
+            "SELECT date_trunc('day', transaction_date) AS date,"
+            " sum(round(amount_usd * 100)::BIGINT) / 100 AS amount_usd, count(*) AS count"
+            f" FROM transactions{where} GROUP BY 1 ORDER BY 1",
+            params,
+        )
+        frame['date'] = frame['date'].astype('datetime64[us]')
+        return frame.set_index('date')
+
+    # Week-over-week changes, with the same weeks and rules as
+    # WeeklyAggregates.change(): active customers are those in the customers
+    # table, though every transaction counts
+    def weekly_change(self, end_date=None):
+        none = {'customers': None, 'transactions': None, 'volume': None}
+        first, last = self.date_bounds()
+        if first is None:
+            return none
+        first_day, last_day = first.normalize(), last.normalize()
+        week = 0 if end_date is None else -(-(last_day - pd.Timestamp(end_date).normalize()).days // 7)
+        previous = week + 1
+        previous_start = last_day - pd.Timedelta(days=7 * previous + 6)
+        if week < 0 or previous_start < first_day:
+            return none
+
+        frame = self._frame(
+            "SELECT (date_diff('day', CAST(t.transaction_date AS DATE), CAST(? AS DATE)) // 7) AS week,"
+            " count(*) AS transactions, sum(round(t.amount_usd * 100)::BIGINT) AS cents,"
+            " count(DISTINCT c.customer_id) AS customers"
+            " FROM transactions t LEFT JOIN accounts a USING (account_id)"
+            " LEFT JOIN customers c USING (customer_id)"
+            " WHERE t.transaction_date >= ? AND t.transaction_date < ? GROUP BY 1",
+            [last_day.to_pydatetime(), previous_start.to_pydatetime(),
+             (last_day - pd.Timedelta(days=7 * week - 1)).to_pydatetime()],
+        ).set_index('week').reindex([week, previous], fill_value=0)
+        current, before = frame.loc[week], frame.loc[previous]
+        return {
+            'customers': int(current['customers'] - before['customers']),
+            'transactions': int(current['transactions'] - before['transactions']),
+            'volume': (int(current['cents']) - int(before['cents'])) / 100,
+        }
+
+    # SELECT over `table` with filters (and the window, for transactions)
+    def _select(self, table, filters=None, sort_by=None, descending=False):
+        where, params = self._where(table, filters, windowed=table == 'transactions')
+        order = ''
+        if sort_by is not None:
+            if sort_by not in self.columns(table):
+                raise KeyError(f"{table} has no column {sort_by!r}")
+            # Missing values sort before every value, as in the in-memory tables
+            direction = ' DESC NULLS LAST' if descending else ' ASC NULLS FIRST'
+            order = ' ORDER BY ' + ', '.join(
+                [_quote(sort_by) + direction] + [_quote(col) for col in TIEBREAK[table] if col != sort_by]
+            )
+        columns = ', '.join(_quote(col) for col in self.columns(table))
+        return f"SELECT {columns} FROM {table}{where}{order}", params
+
+    @staticmethod
+    def columns(table):
+        return ACCOUNT_SUMMARY_COLUMNS if table == 'account_summary' else list(SCHEMA[table])
+
+    # One page of a filtered (and optionally sorted) table
+    def page(self, table, page, page_size, filters=None, sort_by=None, descending=False):
+        sql, params = self._select(table, filters, sort_by, descending)
+        return self._frame(f"{sql} LIMIT ? OFFSET ?", params + [page_size, page * page_size])
+
+    # The newest transactions in the window matching `filters`, newest first
+    def latest(self, n, offset=0, filters=None):
+        sql, params = self._select('transactions', filters, 'transaction_date', descending=True)
+        return self._frame(f"{sql} LIMIT ? OFFSET ?", params + [n, offset])
+
+    # Account count and balance totals for the Account Summary metrics
+    def account_totals(self):
+        n_accounts, cents = self._row("SELECT count(*), sum(round(usd_balance * 100)::BIGINT) FROM account_summary")
+        return {
+            'n_accounts': int(n_accounts),
+            'total_balance_cents': int(cents or 0),
+            'mean_balance_cents': cents / n_accounts if n_accounts else np.nan,
+        }
+
+    # Write a filtered table straight from DuckDB to `path` ('csv', 'csv.gz'
+    # or 'parquet', as in innbucks.export)
+    def export(self, table, path, fmt, filters=None):
+        sql, params = self._select(table, filters)
+        options = {
+            'csv': "FORMAT csv, HEADER",
+            'csv.gz': "FORMAT csv, HEADER, COMPRESSION gzip",
+            'parquet': "FORMAT parquet",
+        }[fmt]
+        self._execute(f"COPY ({sql}) TO {_literal(path)} ({options})", params)
+        return path
@@ -0,0 +1,161 @@
+# innbucks/export.py
+#
+# On-demand table exports. A file is only written when a download is
+# requested, is written in fixed-size chunks (so the whole CSV text never
+# exists in memory at once) and is kept on disk, keyed by what was exported,
+# so repeated downloads of the same selection are served from the file.
+import atexit
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from innbucks.compact import expand_frame
+
+# format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+EXPORT_CHUNK_ROWS = 100_000
+
+
+# Compact frame -> display frames of at most `chunk_rows` rows
+def _display_chunks(df, ids, chunk_rows):
+    for lo in range(0, max(len(df), 1), chunk_rows):
+        yield expand_frame(df.iloc[lo:lo + chunk_rows], ids)
+
+
+# Write `df` (a compact frame) to `path` as `fmt`, one chunk at a time
+def write_export(df, ids, fmt, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in _display_chunks(df, ids, chunk_rows):
+                table = pa.Table.from_pandas(chunk, preserve_index=False, schema=writer and writer.schema)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    opener = gzip.open if fmt == 'csv.gz' else open
+    with opener(path, 'wt', newline='') as f:
+        for i, chunk in enumerate(_display_chunks(df, ids, chunk_rows)):
+            chunk.to_csv(f, index=False, header=i == 0)
+    return path
+
+
+# Process-wide store of written exports, least recently used evicted first.
+# Exports of different keys are written concurrently; concurrent requests for
+# the same key wait for a single write. A file evicted while a read() still
+# holds it is removed by the last reader rather than under it.
+class ExportCache:
+    def __init__(self, directory=None, max_entries=32):
+        self.directory = directory or tempfile.mkdtemp(prefix='innbucks-exports-')
+        self.max_entries = max_entries
+        self._paths = OrderedDict()
+        self._key_locks = {}
+        # path -> number of read() calls holding it, and the evicted paths
+        # still held
+        self._readers = {}
+        self._evicted = set()
+        self._lock = threading.Lock()
+        if directory is None:
+            atexit.register(shutil.rmtree, self.directory, True)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # Path of the cached export for `key`, held for one more reader, or None
+    def _hold(self, key):
+        with self._lock:
+            path = self._paths.get(key)
+            if path is None:
+                return None
+            if not os.path.exists(path):
+                del self._paths[key]
+                return None
+            self._paths.move_to_end(key)
+            self._readers[path] = self._readers.get(path, 0) + 1
+            return path
+
+    def _release(self, path):
+        with self._lock:
+            self._readers[path] -= 1
+            if self._readers[path]:
+                return
+            del self._readers[path]
+            if path in self._evicted:
+                self._evicted.remove(path)
+                self._remove(path)
+
+    # Remove a path that has left _paths now, or once its last reader is done.
+    # Called with self._lock held.
+    def _discard(self, path):
+        if path in self._readers:
+            self._evicted.add(path)
+        else:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Write the export for `key` with write(path), or wait for the write
+    # already in progress, and hold the result
+    def _write(self, key, fmt, write):
+        with self._key_lock(key):
+            # Another session may have written it while we waited
+            path = self._hold(key)
+            if path is not None:
+                return path
+
+            extension, _ = EXPORT_FORMATS[fmt]
+            fd, path = tempfile.mkstemp(suffix=extension, dir=self.directory)
+            os.close(fd)
+            try:
+                write(path)
+            except BaseException:
+                os.remove(path)
+                with self._lock:
+                    if key not in self._paths:
+                        self._key_locks.pop(key, None)
+                raise
+
+            with self._lock:
+                replaced = self._paths.pop(key, None)
+                if replaced is not None:
+                    self._discard(replaced)
+                self._paths[key] = path
+                self._readers[path] = self._readers.get(path, 0) + 1
+                while len(self._paths) > self.max_entries:
+                    stale_key, stale = self._paths.popitem(last=False)
+                    self._key_locks.pop(stale_key, None)
+                    self._discard(stale)
+            return path
+
+    # The export for `key` as bytes, for st.download_button (which keeps the
+    # data in memory to serve it anyway). The file is written by write(path)
+    # on first use; `key` must identify the dataset, the selection and the
+    # format.
+    def read(self, key, fmt, write):
+        path = self._hold(key) or self._write(key, fmt, write)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            self._release(path)
@@ -0,0 +1,111 @@
+# innbucks/lazy.py
+#
+# Polars lazy-frame versions of the dataset's aggregation passes:
+# calculate_kpis(), build_daily_cube() and build_customer_cube(). The compact
+# frames are handed to Polars without copying their numeric columns, each
+# pass is planned as one lazy query, and all of them are collected together
+# so Polars can optimize and run them on its thread pool. Results come back
+# in the same shape as the pandas versions, so everything downstream (the
+# prefix sums, CubePanels, cube_window) is unchanged.
+import polars as pl
+
+from innbucks.cube import CUBE_DIMENSIONS, CUSTOMER_DIMENSIONS, UNKNOWN
+
+KPI_KEYS = [
+    'total_customers', 'total_transactions', 'total_volume',
+    'total_deposits', 'kyc_completion_rate', 'avg_transaction_size',
+]
+
+
+def _lazy(df, columns):
+    return pl.from_pandas(df[columns]).lazy()
+
+
+def _kpis_query(customers, accounts, transactions):
+    return pl.concat([
+        customers.select(
+            pl.col('customer_key').n_unique().alias('total_customers'),
+            # Over every customer: a missing status is not verified
+            (pl.col('kyc_status').cast(pl.String) == 'Verified').fill_null(False).mean().alias('kyc_completion_rate'),
+        ),
+        transactions.select(
+            pl.len().alias('total_transactions'),
+            (pl.col('amount_cents').sum() / 100).alias('total_volume'),
+            (pl.col('amount_cents').mean() / 100).alias('avg_transaction_size'),
+        ),
+        accounts.select((pl.col('balance_cents').sum() / 100).alias('total_deposits')),
+    ], how='horizontal')
+
+
+def _daily_cube_query(customers, accounts, transactions):
+    return (
+        transactions
+        .join(accounts, on='account_key', how='left')
+        .join(customers, on='customer_key', how='left')
+        .group_by(
+            pl.col('transaction_date').dt.truncate('1d').alias('date'),
+            *(pl.col(col).cast(pl.String).fill_null(UNKNOWN) for col in CUBE_DIMENSIONS[1:]),
+        )
+        .agg(pl.len().cast(pl.Int64).alias('count'), pl.col('amount_cents').sum().alias('amount_cents'))
+        .sort(CUBE_DIMENSIONS)
+    )
+
+
+# Like the pandas customer cube, customers missing a dimension form groups
+# of their own (group_by keeps nulls)
+def _customer_cube_query(customers):
+    return (
+        customers
+        .group_by(*(pl.col(col).cast(pl.String) for col in CUSTOMER_DIMENSIONS))
+        .agg(pl.len().cast(pl.Int64).alias('count'))
+    )
+
+
+# The compact frames as lazy frames, projected to the columns used here
+def _frames(customers_df, accounts_df, transactions_df):
+    return (
+        _lazy(customers_df, ['customer_key'] + CUSTOMER_DIMENSIONS),
+        _lazy(accounts_df, ['account_key', 'customer_key', 'balance_cents']),
+        _lazy(transactions_df, ['account_key', 'transaction_date', 'amount_cents', 'transaction_type', 'channel']),
+    )
+
+
+def _kpis_result(kpis):
+    kpis = kpis.row(0, named=True)
+    if kpis['total_transactions'] == 0:
+        kpis['total_volume'] = 0.0
+        kpis['avg_transaction_size'] = float('nan')
+    if kpis['total_customers'] == 0:
+        kpis['kyc_completion_rate'] = float('nan')
+    return {key: kpis[key] for key in KPI_KEYS}
+
+
+def calculate_kpis(customers_df, accounts_df, transactions_df):
+    return _kpis_result(_kpis_query(*_frames(customers_df, accounts_df, transactions_df)).collect())
+
+
+# (kpis, cube, customer_cube) as calculate_kpis(), build_daily_cube() and
+# build_customer_cube() return them, from one parallel collect
+def aggregate(customers_df, accounts_df, transactions_df):
+    customers, accounts, transactions = _frames(customers_df, accounts_df, transactions_df)
+    kpis, cube, customer_cube = pl.collect_all([
+        _kpis_query(customers, accounts, transactions),
+        _daily_cube_query(
+            customers.select('customer_key', 'region', 'customer_type'),
+            accounts.select('account_key', 'customer_key'),
+            transactions,
+        ),
+        _customer_cube_query(customers),
+    ])
+
+    kpis = _kpis_result(kpis)
+    cube = cube.to_pandas()
+    cube['date'] = cube['date'].astype('datetime64[us]')
+
+    # Same categories (and so the same group order) as the pandas customer
+    # cube, from the string labels; nulls become NaN
+    customer_cube = customer_cube.to_pandas()
+    for col in CUSTOMER_DIMENSIONS:
+        customer_cube[col] = customer_cube[col].astype(customers_df[col].dtype)
+    customer_cube = customer_cube.sort_values(CUSTOMER_DIMENSIONS, ignore_index=True)
+    return kpis, cube, customer_cube
@@ -0,0 +1,54 @@
+# innbucks/prefix.py
+import numpy as np
+
+
+# Per-day cumulative sums of the transaction KPIs, built from the daily cube.
+#
+# Row d of each array holds the total over all days before day d, so the total
+# for days [a, b] is cum[b + 1] - cum[a]: two lookups whatever the window.
+class DailyPrefixSums:
+    def __init__(self, cube):
+        dates = cube['date'].to_numpy().astype('datetime64[D]')
+        self.first_day = dates.min() if len(dates) else np.datetime64('1970-01-01', 'D')
+        day = (dates - self.first_day).astype('int64')
+        n_days = int(day.max(initial=-1)) + 1
+
+        counts = cube['count'].to_numpy()
+        cents = cube['amount_cents'].to_numpy()
+
+        self.n_days = n_days
+        self.cum_count = self._cumulative(np.bincount(day, weights=counts, minlength=n_days))
+        self.cum_cents = self._cumulative(np.bincount(day, weights=cents, minlength=n_days))
+
+    # Prepend a zero row and accumulate over days, exactly, in int64
+    @staticmethod
+    def _cumulative(per_day):
+        return np.concatenate([[0], np.cumsum(np.rint(per_day).astype('int64'))])
+
+    # Row bounds [lo, hi) for the whole days start_date..end_date inclusive
+    def _bounds(self, start_date=None, end_date=None):
+        lo = 0 if start_date is None else int((np.datetime64(start_date, 'D') - self.first_day).astype('int64'))
+        hi = self.n_days if end_date is None else int((np.datetime64(end_date, 'D') - self.first_day).astype('int64')) + 1
+        lo = min(max(lo, 0), self.n_days)
+        hi = min(max(hi, lo), self.n_days)
+        return lo, hi
+
+    # Transaction totals for the whole days start_date..end_date inclusive
+    def window_totals(self, start_date=None, end_date=None):
+        lo, hi = self._bounds(start_date, end_date)
+        count = int(self.cum_count[hi] - self.cum_count[lo])
+        cents = int(self.cum_cents[hi] - self.cum_cents[lo])
+        return {
+            'total_transactions': count,
+            'total_volume': cents / 100,
+            'avg_transaction_size': cents / count / 100 if count else float('nan'),
+        }
+
+    # calculate_kpis() output for a date window: the customer and deposit
+    # KPIs do not depend on the window and are taken from `kpis`
+    def window_kpis(self, kpis, start_date=None, end_date=None):
+        totals = self.window_totals(start_date, end_date)
+        window = dict(kpis)
+        for key in ('total_transactions', 'total_volume', 'avg_transaction_size'):
+            window[key] = totals[key]
+        return window
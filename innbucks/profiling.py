@@ -0,0 +1,77 @@
+# innbucks/profiling.py
+#
+# Per-section timing for one run of the dashboard script: wall time, rows
+# processed and bytes of table/chart data sent to the browser, per section.
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from innbucks.table import payload_bytes
+
+
+# Records the sections of one script run, in the order they ran. When
+# `enabled` is False every method is a no-op, so the instrumentation can stay
+# in the script at no cost.
+class RenderProfile:
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self.records = []
+        self.started_at = time.time()
+        self._clock = clock
+        self._current = None
+        self._started = None
+
+    # Start timing section `name`, ending the previous one. Suits a script
+    # laid out as a flat sequence of sections.
+    def begin(self, name):
+        self.end()
+        if self.enabled:
+            self._current = {'section': name, 'seconds': 0.0, 'rows': 0, 'payload_bytes': 0}
+            self._started = self._clock()
+
+    # End the section started by begin(), if any
+    def end(self):
+        if self._current is not None:
+            self._current['seconds'] = self._clock() - self._started
+            self.records.append(self._current)
+            self._current = None
+
+    # Time the body of a with-block as its own section
+    @contextmanager
+    def section(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    # Count `n` rows processed by the current section
+    def rows(self, n):
+        if self._current is not None:
+            self._current['rows'] += int(n)
+
+    # Count a frame or series sent to the browser by the current section
+    def sent(self, data):
+        if self._current is not None:
+            frame = data.to_frame() if hasattr(data, 'to_frame') else data
+            self._current['payload_bytes'] += payload_bytes(frame)
+
+    def total_seconds(self):
+        return sum(record['seconds'] for record in self.records)
+
+    # One JSON object per section, tagged with the run's start time
+    def json_lines(self, **tags):
+        return ''.join(
+            json.dumps({'run_at': self.started_at, **tags, **record}) + '\n' for record in self.records
+        )
+
+
+_dump_lock = threading.Lock()
+
+
+# Append a run's sections to a JSON lines file (safe across sessions)
+def dump_json_lines(profile, path, **tags):
+    lines = profile.json_lines(**tags)
+    with _dump_lock, open(path, 'a') as f:
+        f.write(lines)
@@ -0,0 +1,133 @@
+# innbucks/snapshot.py
+#
+# Columnar snapshot of a dataset's compact frames, for fast startup: one
+# uncompressed Arrow IPC file per table, opened memory-mapped. Opening a
+# snapshot maps the files rather than reading them: columns are zero-copy
+# views of the mapping, the OS pages data in as it is touched, and every
+# dashboard process opening the same snapshot shares those pages through the
+# page cache instead of holding a private copy.
+#
+#   SNAPSHOT/snapshot.json        id codec parameters
+#   SNAPSHOT/customers.arrow
+#   SNAPSHOT/accounts.arrow
+#   SNAPSHOT/transactions.arrow   sorted by transaction_date, the order
+#                                 TransactionStore keeps, so it is not re-sorted
+#   SNAPSHOT/ids-*.arrow          account offsets (synthetic data) or the
+#                                 labels of a real export
+#
+# Serve one with INNBUCKS_SOURCE=snapshot:SNAPSHOT. To write one:
+#
+#   python -m innbucks.snapshot SNAPSHOT [--source URI] [--customers N]
+#       [--days 30] [--seed 42] [--workers 1]
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from innbucks.compact import LabelIds, SyntheticIds
+from innbucks.sources import open_source
+
+TABLES = ['customers', 'accounts', 'transactions']
+METADATA = 'snapshot.json'
+
+
+def _write_table(path, df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = path + '.tmp'
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+# The table in an Arrow IPC file as a DataFrame whose columns are views of
+# the memory-mapped file
+def _open_table(path):
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+# Write the compact frames and id codec of a dataset to the directory `path`
+def write_snapshot(path, customers_df, accounts_df, transactions_df, ids):
+    os.makedirs(path, exist_ok=True)
+    metadata_path = os.path.join(path, METADATA)
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+    dates = transactions_df['transaction_date'].to_numpy()
+    if len(dates) and not (dates[1:] >= dates[:-1]).all():
+        transactions_df = transactions_df.sort_values('transaction_date', kind='stable', ignore_index=True)
+
+    if isinstance(ids, SyntheticIds):
+        metadata = {
+            'ids': 'synthetic',
+            'first_account': int(ids.first_account),
+            'first_transaction': int(ids.first_transaction),
+        }
+        id_columns = {'account_offsets': pd.DataFrame({'account_offsets': ids.account_offsets})}
+    else:
+        # Labels in key order; transaction keys are positions in the source
+        metadata = {'ids': 'labels'}
+        id_columns = {
+            'customer_ids': pd.DataFrame({'labels': ids.customer_ids(np.arange(len(customers_df)))}),
+            'account_ids': pd.DataFrame({'labels': ids.account_ids(np.arange(len(accounts_df)))}),
+            'transaction_ids': pd.DataFrame({'labels': ids.transaction_ids(np.arange(len(transactions_df)))}),
+        }
+
+    for name, df in zip(TABLES, (customers_df, accounts_df, transactions_df)):
+        _write_table(os.path.join(path, f'{name}.arrow'), df)
+    for name, df in id_columns.items():
+        _write_table(os.path.join(path, f'ids-{name}.arrow'), df)
+    # Written last: a directory without it is not a complete snapshot
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f)
+
+
+# Open the snapshot in `path` as (customers_df, accounts_df, transactions_df, ids)
+def open_snapshot(path):
+    try:
+        with open(os.path.join(path, METADATA)) as f:
+            metadata = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{path} is not a complete snapshot (no {METADATA})") from None
+    frames = [_open_table(os.path.join(path, f'{name}.arrow')) for name in TABLES]
+
+    def id_column(name, column):
+        return _open_table(os.path.join(path, f'ids-{name}.arrow'))[column]
+
+    if metadata['ids'] == 'synthetic':
+        ids = SyntheticIds(
+            id_column('account_offsets', 'account_offsets').to_numpy(),
+            first_account=metadata['first_account'],
+            first_transaction=metadata['first_transaction'],
+        )
+    else:
+        ids = LabelIds(
+            id_column('customer_ids', 'labels'),
+            id_column('account_ids', 'labels'),
+            id_column('transaction_ids', 'labels'),
+        )
+    return (*frames, ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m innbucks.snapshot')
+    parser.add_argument('path', help="snapshot directory")
+    parser.add_argument('--source', default='synthetic', help="data source URI (see innbucks.sources)")
+    parser.add_argument('--customers', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+    customers_df, accounts_df, transactions_df, ids = open_source(
+        args.source, n_customers=args.customers, days=args.days, seed=args.seed, workers=args.workers or None
+    ).load_compact()
+    write_snapshot(args.path, customers_df, accounts_df, transactions_df, ids)
+    print(f"{len(customers_df):,} customers, {len(accounts_df):,} accounts and "
+          f"{len(transactions_df):,} transactions in {args.path}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
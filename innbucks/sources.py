@@ -0,0 +1,218 @@
+# innbucks/sources.py
+#
+# Data sources returning the customers_df / accounts_df / transactions_df
+# contract the dashboard renders from. load() returns the string-keyed frames
+# described by SCHEMA; load_compact() returns the layout of innbucks.compact
+# plus its id codec. A source is named by a URI:
+#
+#   synthetic                 generate_innbucks_data() (the default)
+#   parquet:/path/to/dir      customers.parquet, accounts.parquet, transactions.parquet
+#   csv:/path/to/dir          customers.csv, accounts.csv, transactions.csv
+#   sqlite:/path/to/file.db   tables customers, accounts, transactions
+#   snapshot:/path/to/dir     memory-mapped snapshot (see innbucks.snapshot)
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from innbucks.compact import compact_frames
+from innbucks.data import generate_compact_data, generate_innbucks_data, string_frame
+
+TABLES = ['customers', 'accounts', 'transactions']
+
+# Columns the dashboard uses, with the dtype each is read as. Only these
+# columns are read from disk; anything else in the export is ignored.
+SCHEMA = {
+    'customers': {
+        'customer_id': 'str',
+        'customer_type': 'str',
+        'region': 'str',
+        'branch': 'str',
+        'mobile_network': 'str',
+        'kyc_status': 'str',
+    },
+    'accounts': {
+        'customer_id': 'str',
+        'account_id': 'str',
+        'usd_balance': 'float64',
+        'account_status': 'str',
+    },
+    'transactions': {
+        'transaction_id': 'str',
+        'account_id': 'str',
+        'transaction_date': 'datetime64[us]',
+        'amount_usd': 'float64',
+        'transaction_type': 'str',
+        'channel': 'str',
+        'status': 'str',
+    },
+}
+
+# Columns that identify a row and must never be null
+KEY_COLUMNS = {
+    'customers': ['customer_id'],
+    'accounts': ['customer_id', 'account_id'],
+    'transactions': ['transaction_id', 'account_id', 'transaction_date'],
+}
+
+CSV_CHUNKSIZE = 500_000
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# Check a loaded table against SCHEMA and return it projected and typed
+def validate_frame(table, df):
+    schema = SCHEMA[table]
+    missing = [col for col in schema if col not in df.columns]
+    if missing:
+        raise SchemaError(f"{table}: missing columns {', '.join(missing)}")
+
+    columns = {}
+    for col, dtype in schema.items():
+        values = df[col]
+        try:
+            if dtype.startswith('datetime64') and not pd.api.types.is_datetime64_any_dtype(values):
+                values = pd.to_datetime(values, format='ISO8601')
+            if str(values.dtype) != dtype:
+                values = values.astype(dtype)
+        except (TypeError, ValueError) as exc:
+            raise SchemaError(f"{table}.{col}: cannot convert to {dtype} ({exc})") from exc
+        columns[col] = values.reset_index(drop=True)
+
+    for col in KEY_COLUMNS[table]:
+        if columns[col].isna().any():
+            raise SchemaError(f"{table}.{col}: contains null values")
+    return pd.DataFrame(columns)
+
+
+# Synthetic data, as generated for the demo dashboard
+class SyntheticSource:
+    def __init__(self, n_customers=1000, days=30, seed=42, workers=1):
+        self.n_customers = n_customers
+        self.days = days
+        self.seed = seed
+        self.workers = workers
+
+    def load(self):
+        return generate_innbucks_data(
+            n_customers=self.n_customers, days=self.days, seed=self.seed, workers=self.workers
+        )
+
+    def load_compact(self):
+        return generate_compact_data(
+            n_customers=self.n_customers, days=self.days, seed=self.seed, workers=self.workers
+        )
+
+
+# One Parquet file (or partitioned directory, as innbucks.writer writes) per table
+class ParquetSource:
+    def __init__(self, path):
+        self.path = path
+
+    def _table_path(self, table):
+        directory = os.path.join(self.path, table)
+        return directory if os.path.isdir(directory) else os.path.join(self.path, f'{table}.parquet')
+
+    def read_table(self, table):
+        try:
+            df = pd.read_parquet(self._table_path(table), columns=list(SCHEMA[table]))
+        except (KeyError, ValueError) as exc:
+            raise SchemaError(f"{table}: {exc}") from exc
+        return validate_frame(table, df)
+
+    def load(self):
+        return tuple(self.read_table(table) for table in TABLES)
+
+    def load_compact(self):
+        return compact_frames(*self.load())
+
+
+# One CSV file per table, read in chunks with explicit dtypes
+class CsvSource:
+    def __init__(self, path, chunksize=CSV_CHUNKSIZE):
+        self.path = path
+        self.chunksize = chunksize
+
+    def read_table(self, table):
+        schema = SCHEMA[table]
+        # Timestamps are read as text and parsed with a fixed format below,
+        # so pandas never has to sniff a column's type
+        dtypes = {col: ('str' if dtype.startswith('datetime64') else dtype) for col, dtype in schema.items()}
+        try:
+            chunks = pd.read_csv(
+                os.path.join(self.path, f'{table}.csv'),
+                usecols=list(schema),
+                dtype=dtypes,
+                chunksize=self.chunksize,
+            )
+            df = pd.concat(chunks, ignore_index=True)
+        except ValueError as exc:
+            raise SchemaError(f"{table}: {exc}") from exc
+        return validate_frame(table, df)
+
+    def load(self):
+        return tuple(self.read_table(table) for table in TABLES)
+
+    def load_compact(self):
+        return compact_frames(*self.load())
+
+
+# One SQLite database holding a table per frame
+class SqliteSource:
+    def __init__(self, path):
+        self.path = path
+
+    def read_table(self, table):
+        columns = ', '.join(f'"{col}"' for col in SCHEMA[table])
+        try:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        except sqlite3.Error as exc:
+            raise OSError(f"cannot open {self.path}: {exc}") from exc
+        with closing(conn):
+            try:
+                df = pd.read_sql_query(f'SELECT {columns} FROM "{table}"', conn)
+            except (sqlite3.Error, pd.errors.DatabaseError) as exc:
+                raise SchemaError(f"{table}: {exc}") from exc
+        return validate_frame(table, df)
+
+    def load(self):
+        return tuple(self.read_table(table) for table in TABLES)
+
+    def load_compact(self):
+        return compact_frames(*self.load())
+
+
+# A snapshot written by innbucks.snapshot, already in the compact layout and
+# opened memory-mapped
+class SnapshotSource:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        customers_df, accounts_df, transactions_df, ids = self.load_compact()
+        return tuple(string_frame(df, ids) for df in (customers_df, accounts_df, transactions_df))
+
+    def load_compact(self):
+        from innbucks.snapshot import open_snapshot
+        return open_snapshot(self.path)
+
+
+SOURCES = {
+    'parquet': ParquetSource,
+    'csv': CsvSource,
+    'sqlite': SqliteSource,
+    'snapshot': SnapshotSource,
+}
+
+
+# Resolve a source URI such as 'parquet:/data/innbucks' to a source object
+def open_source(uri=None, **synthetic_params):
+    if not uri or uri == 'synthetic':
+        return SyntheticSource(**synthetic_params)
+    kind, sep, path = uri.partition(':')
+    if not sep or kind not in SOURCES:
+        raise ValueError(f"Unknown data source {uri!r}; expected one of synthetic, {', '.join(SOURCES)}")
+    return SOURCES[kind](os.path.expanduser(path))
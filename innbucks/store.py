@@ -0,0 +1,76 @@
+# innbucks/store.py
+import numpy as np
+import pandas as pd
+
+from innbucks.bitmap import BitmapIndex
+
+# Categorical columns the Transaction Data filters select on
+INDEX_COLUMNS = ['transaction_type', 'channel']
+
+
+# Transactions kept sorted by transaction_date, so a date window is a
+# contiguous slice found by binary search: O(log n + k) for k rows instead
+# of a boolean mask over the whole frame.
+class TransactionStore:
+    def __init__(self, transactions_df, index_columns=INDEX_COLUMNS):
+        dates = transactions_df['transaction_date'].to_numpy()
+        if len(dates) and not (dates[1:] >= dates[:-1]).all():
+            order = np.argsort(dates, kind='stable')
+            transactions_df = transactions_df.take(order)
+        self.transactions_df = transactions_df.reset_index(drop=True)
+        self._dates = self.transactions_df['transaction_date'].to_numpy()
+        self.index = BitmapIndex(self.transactions_df, index_columns)
+
+    def __len__(self):
+        return len(self._dates)
+
+    @property
+    def first_date(self):
+        return pd.Timestamp(self._dates[0]) if len(self._dates) else None
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(self._dates[-1]) if len(self._dates) else None
+
+    # Row positions [lo, hi) of transactions in [start, end); None leaves a side open
+    def bounds(self, start=None, end=None):
+        lo = 0 if start is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), side='left'))
+        hi = len(self._dates) if end is None else int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), side='left'))
+        return lo, max(lo, hi)
+
+    # Transactions in [start, end), as a slice of the sorted frame
+    def window(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return self.transactions_df.iloc[lo:hi]
+
+    # Positions of the newest transactions in [start, end) matching `filters`
+    # ({column: value or list of values}, see BitmapIndex.select), newest
+    # first, skipping the first `offset` matches. The filter bitset is
+    # unpacked backwards from the end of the window in doubling blocks, so the
+    # cost is proportional to offset + n (divided by the filters'
+    # selectivity), not to the size of the window.
+    def latest_positions(self, n, offset=0, filters=None, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        bitset = self.index.select(filters or {})
+        want = offset + n
+        found, n_found = [], 0
+        block = max(want, 1024)
+        while hi > lo and n_found < want:
+            block_lo = max(lo, hi - block)
+            positions = self.index.positions(bitset, block_lo, hi)
+            found.append(positions[::-1])
+            n_found += len(positions)
+            hi, block = block_lo, block * 2
+        if not found:
+            return np.empty(0, dtype='int64')
+        return np.concatenate(found)[offset:want]
+
+    # The newest transactions as a frame, newest first (see latest_positions)
+    def latest(self, n, offset=0, filters=None, start=None, end=None):
+        return self.transactions_df.iloc[self.latest_positions(n, offset, filters, start, end)]
+
+
+# Whole-day window [start_date, end_date] as the half-open [start, end)
+# timestamps TransactionStore.window() takes
+def day_window(start_date, end_date):
+    return pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
@@ -0,0 +1,29 @@
+# innbucks/summary.py
+import numpy as np
+import pandas as pd
+
+
+# Denormalized account + customer view behind the Account Summary tab, built
+# once per dataset. customer_key is the customer's row position in
+# customers_df (see innbucks.compact), so the join is a positional take
+# instead of a hash merge; rows come out in accounts_df order, like
+# accounts_df.merge(customers_df, on='customer_key').
+class AccountSummary:
+    def __init__(self, customers_df, accounts_df):
+        customer = accounts_df['customer_key'].to_numpy().astype('int64')
+        known = (customer >= 0) & (customer < len(customers_df))
+        if not known.all():
+            accounts_df = accounts_df[known]
+            customer = customer[known]
+        customer_columns = customers_df.drop(columns='customer_key').take(customer)
+        self.frame = pd.concat(
+            [accounts_df.reset_index(drop=True), customer_columns.reset_index(drop=True)], axis=1
+        )
+
+        balances = self.frame['balance_cents'].to_numpy()
+        self.n_accounts = len(balances)
+        self.total_balance_cents = int(balances.sum())
+        self.mean_balance_cents = self.total_balance_cents / self.n_accounts if self.n_accounts else np.nan
+
+    def __len__(self):
+        return self.n_accounts
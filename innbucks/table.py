@@ -0,0 +1,147 @@
+# innbucks/table.py
+#
+# Server-side paging for large tables: only the rows of the visible page are
+# gathered, formatted and sent to the browser.
+import io
+
+import numpy as np
+import pandas as pd
+
+from innbucks.compact import expand_frame
+from innbucks.export import write_export
+
+
+# Numeric keys that order a column the way it sorts in the table
+def sort_keys(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype('int64')
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy().view('int64')
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy()
+    return pd.factorize(values, sort=True)[0]
+
+
+# Number of pages needed for n_rows rows (at least one, even when empty)
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+# Stable sort orders of one frame's columns, ascending and descending, each
+# argsorted on first use and then shared by every rerun and session
+class SortOrders:
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+
+    def order(self, column, descending=False):
+        order = self._orders.get((column, descending))
+        if order is None:
+            keys = sort_keys(self.df[column])
+            order = np.argsort(-keys if descending else keys, kind='stable')
+            self._orders[column, descending] = order
+        return order
+
+
+# Size in bytes of a frame as serialized for the browser (Arrow IPC, the
+# format st.dataframe sends)
+def payload_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.tell()
+
+
+# The Detailed Data Views queries over an in-memory Dataset (see
+# innbucks.cache): filtered, paged tables and the newest transactions, as
+# display frames. innbucks.duck.DuckDBQueries answers the same methods from
+# Parquet files instead. Filters are {column: value or list of values}
+# resolved on the dataset's bitmap indexes; transactions are restricted to
+# the window [start, end).
+class DatasetTables:
+    def __init__(self, dataset, start=None, end=None):
+        self.dataset = dataset
+        self.start, self.end = start, end
+
+    def window(self, start=None, end=None):
+        return DatasetTables(self.dataset, start, end)
+
+    # Rows of `table` matching `filters` (and the window), without touching
+    # the frame: (frame, bitmap index, bitset, lo, hi), where the rows are
+    # the positions in [lo, hi) set in the bitset (all of them when None)
+    def _selection(self, table, filters=None):
+        dataset = self.dataset
+        if table == 'customers':
+            index = dataset.customer_index
+            return dataset.customers_df, index, index.select(filters or {}), 0, index.n_rows
+        if table == 'transactions':
+            store = dataset.store
+            lo, hi = store.bounds(self.start, self.end)
+            return store.transactions_df, store.index, store.index.select(filters or {}), lo, hi
+        if table == 'account_summary':
+            if filters:
+                raise ValueError("account_summary cannot be filtered")
+            frame = dataset.account_summary.frame
+            return frame, None, None, 0, len(frame)
+        raise KeyError(table)
+
+    # Compact frame of `table` restricted to `filters` (and the window)
+    def _frame(self, table, filters=None):
+        df, index, bitset, lo, hi = self._selection(table, filters)
+        if bitset is None:
+            return df.iloc[lo:hi]
+        return df.iloc[index.positions(bitset, lo, hi)]
+
+    def columns(self, table):
+        frames = {
+            'customers': self.dataset.customers_df,
+            'transactions': self.dataset.store.transactions_df,
+            'account_summary': self.dataset.account_summary.frame,
+        }
+        return list(frames[table].columns)
+
+    def values(self, table, column):
+        index = self.dataset.customer_index if table == 'customers' else self.dataset.store.index
+        return index.values(column)
+
+    def count(self, table, filters=None):
+        _, index, bitset, lo, hi = self._selection(table, filters)
+        return hi - lo if bitset is None else index.count(bitset, lo, hi)
+
+    # One page of `table`. Filtering, sorting and paging work on row
+    # positions (the sort order comes from the dataset's SortOrders); only
+    # the page's own rows are gathered from the frame.
+    def page(self, table, page, page_size, filters=None, sort_by=None, descending=False):
+        df, index, bitset, lo, hi = self._selection(table, filters)
+        first = page * page_size
+        if sort_by is None:
+            if bitset is None:
+                positions = np.arange(min(lo + first, hi), min(lo + first + page_size, hi))
+            else:
+                positions = index.positions(bitset, lo, hi)[first:first + page_size]
+        else:
+            order = self.dataset.sort_orders[table].order(sort_by, descending)
+            if bitset is not None or hi - lo < len(df):
+                selected = np.zeros(len(df), dtype=bool)
+                selected[lo:hi] = index.mask(bitset, lo, hi) if bitset is not None else True
+                order = order[selected[order]]
+            positions = order[first:first + page_size]
+        return expand_frame(df.iloc[positions], self.dataset.ids)
+
+    def latest(self, n, offset=0, filters=None):
+        rows = self.dataset.store.latest(n, offset, filters, self.start, self.end)
+        return expand_frame(rows, self.dataset.ids)
+
+    def account_totals(self):
+        summary = self.dataset.account_summary
+        return {
+            'n_accounts': summary.n_accounts,
+            'total_balance_cents': summary.total_balance_cents,
+            'mean_balance_cents': summary.mean_balance_cents,
+        }
+
+    def export(self, table, path, fmt, filters=None):
+        return write_export(self._frame(table, filters), self.dataset.ids, fmt, path)
@@ -0,0 +1,53 @@
+# innbucks/weekly.py
+import numpy as np
+import pandas as pd
+
+
+# Transactions, volume and active customers in 7-day buckets counted back from
+# the last day with data: bucket 0 is the last 7 days, bucket 1 the 7 before
+# that, and so on. Built once per dataset, so week-over-week changes are
+# deterministic and cost two array lookups.
+class WeeklyAggregates:
+    def __init__(self, accounts_df, transactions_df):
+        days = transactions_df['transaction_date'].to_numpy().astype('datetime64[D]')
+        if len(days):
+            self.first_day, self.last_day = days.min(), days.max()
+        else:
+            self.first_day = self.last_day = np.datetime64('1970-01-01', 'D')
+        week = (self.last_day - days).astype('int64') // 7
+        n_weeks = int(week.max(initial=-1)) + 1
+
+        self.transactions = np.bincount(week, minlength=n_weeks)
+        self.volume_cents = np.rint(
+            np.bincount(week, weights=transactions_df['amount_cents'].to_numpy(), minlength=n_weeks)
+        ).astype('int64')
+
+        # Distinct (week, customer) pairs, counted per week
+        account_customer = accounts_df['customer_key'].to_numpy().astype('int64')
+        txn_account = transactions_df['account_key'].to_numpy()
+        customer = np.where(txn_account >= 0, account_customer[txn_account], -1)
+        known = customer >= 0
+        n_customers = int(account_customer.max(initial=-1)) + 1
+        pairs = pd.unique(week[known] * n_customers + customer[known])
+        self.active_customers = np.bincount(pairs // max(n_customers, 1), minlength=n_weeks)
+
+    # Bucket of the latest full 7 days ending on or before end_date
+    def _week(self, end_date=None):
+        if end_date is None:
+            return 0
+        return -(-int((self.last_day - np.datetime64(end_date, 'D')).astype('int64')) // 7)
+
+    # Change of each measure between the latest week ending on or before
+    # end_date and the week before it; None where either week is missing or
+    # only partly covered by the data
+    def change(self, end_date=None):
+        week = self._week(end_date)
+        previous = week + 1
+        previous_start = self.last_day - np.timedelta64(7 * previous + 6, 'D')
+        if week < 0 or previous >= len(self.transactions) or previous_start < self.first_day:
+            return {'customers': None, 'transactions': None, 'volume': None}
+        return {
+            'customers': int(self.active_customers[week] - self.active_customers[previous]),
+            'transactions': int(self.transactions[week] - self.transactions[previous]),
+            'volume': (self.volume_cents[week] - self.volume_cents[previous]) / 100,
+        }
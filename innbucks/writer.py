@@ -0,0 +1,169 @@
+# innbucks/writer.py
+#
+# Out-of-core synthetic data writer. Generates a dataset of any size with the
+# distributions of generate_innbucks_data() and streams it to Parquet one
+# chunk of customers at a time, so memory is bounded by the chunk size rather
+# than the dataset:
+#
+#   OUT/customers/part-00000.parquet
+#   OUT/accounts/part-00000.parquet
+#   OUT/transactions/date=2025-01-01/part-00000.parquet
+#
+# Chunk i draws from stream i spawned from the seed, so with the default
+# chunk size the data is the same as generate_innbucks_data() with the same
+# parameters. Every file is written under a hidden temporary name and then
+# renamed, and a chunk is recorded in OUT/_progress once all its files are
+# in place: rerunning an interrupted run with the same arguments carries on
+# from the first chunk not recorded. Read the output back with the
+# parquet:OUT source (or the duckdb engine).
+#
+#   python -m innbucks.writer OUT [--customers N] [--days 365] [--seed 42]
+#       [--transactions-per-account 15] [--chunk-customers 100000]
+#       [--start-date 2025-01-01]
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from innbucks.data import (
+    SHARD_CUSTOMERS, TRANSACTIONS_PER_ACCOUNT, compact_shard, generate_shard, shard_sizes, string_frame,
+)
+
+MANIFEST = '_writer.json'
+PROGRESS = '_progress'
+
+
+def _part_name(chunk):
+    return f'part-{chunk:05d}'
+
+
+# Write `data` (a DataFrame, or a dict for JSON) to `path` atomically
+def _write(data, path):
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f'.{name}.tmp')
+    if isinstance(data, dict):
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+    else:
+        data.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+# Parameters of the run in `out`: recorded on the first run, and checked
+# (with the recorded start date filled in) when resuming
+def _manifest(out, params):
+    path = os.path.join(out, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)
+        if params['start_date'] is None:
+            params['start_date'] = saved['start_date']
+        if saved != params:
+            raise ValueError(f"{out} holds a run with different parameters: {saved}")
+        return params
+    if params['start_date'] is None:
+        params['start_date'] = (datetime.date.today() - datetime.timedelta(days=params['days'])).isoformat()
+    _write(params, path)
+    return params
+
+
+# Generate and write chunk `chunk`; returns its (customers, transactions)
+def write_chunk(out, chunk, seed_sequence, n_customers, params, first_customer, first_transaction):
+    columns = generate_shard(seed_sequence, n_customers, params['days'], params['transactions_per_account'])
+    start_date = datetime.date.fromisoformat(params['start_date'])
+    customers_df, accounts_df, transactions_df, ids = compact_shard(
+        columns, start_date, first_customer, first_transaction
+    )
+    name = _part_name(chunk) + '.parquet'
+    _write(string_frame(customers_df, ids), os.path.join(out, 'customers', name))
+    _write(string_frame(accounts_df, ids), os.path.join(out, 'accounts', name))
+
+    # One file per day; within a day transactions stay in key order
+    day = columns['seconds'] // 86400
+    order = np.argsort(day, kind='stable')
+    days, starts = np.unique(day[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    for offset, lo, hi in zip(days, starts, ends):
+        date = start_date + datetime.timedelta(days=int(offset))
+        part = string_frame(transactions_df.iloc[order[lo:hi]], ids)
+        _write(part, os.path.join(out, 'transactions', f'date={date.isoformat()}', name))
+    return len(customers_df), len(transactions_df)
+
+
+def write_dataset(out, n_customers, days=365, seed=42, transactions_per_account=TRANSACTIONS_PER_ACCOUNT,
+                  chunk_customers=SHARD_CUSTOMERS, start_date=None, log=print):
+    params = _manifest(out, {
+        'n_customers': n_customers,
+        'days': days,
+        'seed': seed,
+        'transactions_per_account': transactions_per_account,
+        'chunk_customers': chunk_customers,
+        'start_date': start_date,
+    })
+    sizes = shard_sizes(n_customers, chunk_customers)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    first_customer = first_transaction = 0
+    rows_written = 0
+    started = time.perf_counter()
+    for chunk, (seed_sequence, size) in enumerate(zip(streams, sizes)):
+        progress_path = os.path.join(out, PROGRESS, _part_name(chunk) + '.json')
+        if os.path.exists(progress_path):
+            with open(progress_path) as f:
+                done = json.load(f)
+        else:
+            chunk_started = time.perf_counter()
+            customers, transactions = write_chunk(
+                out, chunk, seed_sequence, size, params, first_customer, first_transaction
+            )
+            done = {'customers': customers, 'transactions': transactions}
+            _write(done, progress_path)
+
+            rows = 2 * customers + transactions
+            rows_written += rows
+            elapsed = time.perf_counter() - chunk_started
+            log(f"chunk {chunk + 1}/{len(sizes)}: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s); "
+                f"{rows_written / (time.perf_counter() - started):,.0f} rows/s overall")
+        first_customer += done['customers']
+        first_transaction += done['transactions']
+
+    elapsed = time.perf_counter() - started
+    log(f"{first_customer:,} customers and {first_transaction:,} transactions in {out}; "
+        f"wrote {rows_written:,} rows in {elapsed:.1f}s ({rows_written / max(elapsed, 1e-9):,.0f} rows/s)")
+    return first_customer, first_transaction
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m innbucks.writer')
+    parser.add_argument('out', help="output directory")
+    parser.add_argument('--customers', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--transactions-per-account', type=float, default=TRANSACTIONS_PER_ACCOUNT,
+                        help="mean transactions per account over the whole period")
+    parser.add_argument('--chunk-customers', type=int, default=SHARD_CUSTOMERS,
+                        help="customers generated and written at a time (bounds memory)")
+    parser.add_argument('--start-date', help="first day, YYYY-MM-DD (default: DAYS days ago)")
+    args = parser.parse_args(argv)
+    if args.start_date is not None:
+        try:
+            datetime.date.fromisoformat(args.start_date)
+        except ValueError:
+            parser.error(f"--start-date {args.start_date!r} is not a YYYY-MM-DD date")
+    try:
+        write_dataset(
+            args.out, args.customers, days=args.days, seed=args.seed,
+            transactions_per_account=args.transactions_per_account,
+            chunk_customers=args.chunk_customers, start_date=args.start_date,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,9 +1,19 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import numpy as np
 import datetime
-from datetime import timedelta
+import os
+
+from innbucks.buckets import GRANULARITIES, date_buckets
+from innbucks.cache import DatasetCache
+from innbucks.compact import CENTS_COLUMNS, KEY_COLUMNS
+from innbucks.cube import CubePanels, cube_window
+from innbucks.downsample import downsample
+from innbucks.export import EXPORT_FORMATS, ExportCache
+from innbucks.profiling import RenderProfile, dump_json_lines
+from innbucks.sources import SchemaError
+from innbucks.store import day_window
+from innbucks.table import DatasetTables, page_count
 
 # Set page configuration
 st.set_page_config(
@@ -12,100 +22,128 @@ st.set_page_config(
     layout="wide"
 )
 
-# Generate synthetic data for InnBucks Zimbabwe
-def generate_innbucks_data():
-    np.random.seed(42)
-    
-    # Zimbabwe-specific data
-    branches = ['Harare CBD', 'Bulawayo Central', 'Mutare', 'Gweru']
-    mobile_networks = ['Econet', 'NetOne', 'Telecel']
-    
-    # Customer data
-    n_customers = 1000
-    customer_ids = [f'INN{i:04d}' for i in range(1, n_customers+1)]
-    
-    customers_df = pd.DataFrame({
-        'customer_id': customer_ids,
-        'customer_type': np.random.choice(['Individual', 'Agent', 'Merchant'], n_customers, p=[0.85, 0.1, 0.05]),
-        'region': np.random.choice(['Harare', 'Bulawayo', 'Midlands', 'Masvingo'], n_customers),
-        'branch': np.random.choice(branches, n_customers),
-        'mobile_network': np.random.choice(mobile_networks, n_customers, p=[0.7, 0.2, 0.1]),
-        'kyc_status': np.random.choice(['Verified', 'Pending'], n_customers, p=[0.8, 0.2])
-    })
-    
-    # Account data
-    accounts_data = []
-    for cust_id in customer_ids:
-        usd_balance = max(10, np.random.lognormal(5, 1.2))
-        
-        accounts_data.append({
-            'customer_id': cust_id,
-            'account_id': f'ACC{cust_id}',
-            'usd_balance': usd_balance,
-            'account_status': 'Active'
-        })
-    
-    accounts_df = pd.DataFrame(accounts_data)
-    
-    # Transaction data (last 30 days)
-    transactions_data = []
-    start_date = datetime.datetime.now() - timedelta(days=30)
-    
-    for account in accounts_data:
-        n_transactions = np.random.poisson(15)
-        
-        for i in range(n_transactions):
-            transaction_date = start_date + timedelta(
-                days=np.random.randint(0, 30), 
-                hours=np.random.randint(0, 24)
-            )
-            transaction_type = np.random.choice(
-                ['Send Money', 'Cash In', 'Cash Out', 'Bill Payment', 'Airtime'], 
-                p=[0.4, 0.2, 0.15, 0.15, 0.1]
-            )
-            
-            amount = abs(np.random.lognormal(3.5, 1.0))
-            channel = np.random.choice(['Mobile App', 'USSD', 'Agent'], p=[0.6, 0.3, 0.1])
-            
-            transactions_data.append({
-                'transaction_id': f'TXN{account["account_id"]}{i}',
-                'account_id': account['account_id'],
-                'transaction_date': transaction_date,
-                'amount_usd': amount,
-                'transaction_type': transaction_type,
-                'channel': channel,
-                'status': 'Completed'
-            })
-    
-    transactions_df = pd.DataFrame(transactions_data)
-    
-    return customers_df, accounts_df, transactions_df
-
-# Calculate KPIs
-def calculate_kpis(customers_df, accounts_df, transactions_df):
-    total_customers = customers_df['customer_id'].nunique()
-    total_transactions = len(transactions_df)
-    total_volume = transactions_df['amount_usd'].sum()
-    total_deposits = accounts_df['usd_balance'].sum()
-    kyc_completion_rate = (customers_df['kyc_status'] == 'Verified').mean()
-    avg_transaction_size = transactions_df['amount_usd'].mean()
-    
-    # Weekly growth (simulated)
-    weekly_growth = np.random.uniform(0.05, 0.15)
-    
-    return {
-        'total_customers': total_customers,
-        'total_transactions': total_transactions,
-        'total_volume': total_volume,
-        'total_deposits': total_deposits,
-        'kyc_completion_rate': kyc_completion_rate,
-        'avg_transaction_size': avg_transaction_size,
-        'weekly_growth': weekly_growth
-    }
+# Data source and generation parameters (overridable per deployment).
+# INNBUCKS_SOURCE takes a URI such as parquet:/data/innbucks; see innbucks/sources.py.
+DATA_SOURCE = os.environ.get('INNBUCKS_SOURCE', 'synthetic')
+N_CUSTOMERS = int(os.environ.get('INNBUCKS_CUSTOMERS', 1000))
+DAYS = int(os.environ.get('INNBUCKS_DAYS', 30))
+SEED = int(os.environ.get('INNBUCKS_SEED', 42))
+CACHE_TTL = float(os.environ.get('INNBUCKS_CACHE_TTL', 3600))
+# Query engine: 'memory' (pandas over the cached dataset), 'polars' (the same,
+# with the dataset's KPIs and cubes aggregated by Polars) or 'duckdb' (SQL
+# over the Parquet files of a parquet: source, nothing held in memory)
+ENGINE = os.environ.get('INNBUCKS_ENGINE', 'memory')
+AGGREGATION = 'polars' if ENGINE == 'polars' else 'pandas'
+PERF_LOG = os.environ.get('INNBUCKS_PERF_LOG')
+# Most points sent per trend chart series, and how longer series are reduced
+# (lttb or minmax; see innbucks/downsample.py)
+CHART_POINTS = int(os.environ.get('INNBUCKS_CHART_POINTS', 1000))
+CHART_DOWNSAMPLE = os.environ.get('INNBUCKS_CHART_DOWNSAMPLE', 'lttb')
+
+# One dataset cache per server process, shared read-only by every session
+@st.cache_resource
+def get_dataset_cache():
+    return DatasetCache(ttl=CACHE_TTL)
+
+# One DuckDB connection per server process and Parquet directory
+@st.cache_resource
+def get_duckdb_queries(path):
+    from innbucks.duck import DuckDBQueries
+    return DuckDBQueries(path)
+
+# One export cache per server process, shared by every session
+@st.cache_resource
+def get_export_cache():
+    return ExportCache()
+
+# Per-section timings for this run: shown in a panel when the URL has
+# ?perf=1, appended as JSON lines to INNBUCKS_PERF_LOG when it is set
+show_perf = st.query_params.get('perf') == '1'
+profile = RenderProfile(enabled=show_perf or bool(PERF_LOG))
+
+# Source and engine errors, whether raised while loading or by a later query
+# (a DuckDB view over a bad Parquet file), are shown instead of a traceback
+DATA_ERRORS = (SchemaError, OSError, ValueError)
+
+def stop_with_data_error(exc):
+    st.error(f"Could not load data from {DATA_SOURCE}: {exc}")
+    st.stop()
 
 # Generate data
-customers_df, accounts_df, transactions_df = generate_innbucks_data()
-kpis = calculate_kpis(customers_df, accounts_df, transactions_df)
+profile.begin("Data generation")
+dataset_cache = get_dataset_cache()
+export_cache = get_export_cache()
+try:
+    if ENGINE == 'duckdb':
+        kind, _, path = DATA_SOURCE.partition(':')
+        if kind != 'parquet':
+            raise ValueError("the duckdb engine needs a parquet: source")
+        dataset = get_duckdb_queries(os.path.expanduser(path))
+    elif ENGINE not in ('memory', 'polars'):
+        raise ValueError(f"unknown engine {ENGINE!r}; expected memory, polars or duckdb")
+    elif DATA_SOURCE == 'synthetic':
+        dataset = dataset_cache.get(n_customers=N_CUSTOMERS, days=DAYS, seed=SEED, engine=AGGREGATION)
+    else:
+        dataset = dataset_cache.get(source=DATA_SOURCE, engine=AGGREGATION)
+except DATA_ERRORS as exc:
+    stop_with_data_error(exc)
+dataset_version = (DATA_SOURCE, ENGINE, N_CUSTOMERS, DAYS, SEED, dataset.built_at)
+if ENGINE == 'duckdb':
+    try:
+        first_date, last_date = dataset.date_bounds()
+    except DATA_ERRORS as exc:
+        stop_with_data_error(exc)
+    tables = dataset
+else:
+    profile.rows(len(dataset.transactions_df))
+    first_date, last_date = dataset.store.first_date, dataset.store.last_date
+    tables = DatasetTables(dataset)
+
+# Date range for the whole dashboard. In memory, transactions and the daily
+# cube are both sorted by date, so the window is two binary searches rather
+# than a scan, and the window's KPIs come from the per-day prefix sums. With
+# DuckDB the window is pushed down into every query.
+profile.begin("KPIs")
+window_start = window_end = end_day = None
+if first_date is not None:
+    first_day, last_day = first_date.date(), last_date.date()
+    date_range = st.sidebar.date_input(
+        "Date range", value=(first_day, last_day), min_value=first_day, max_value=last_day
+    )
+    start_day, end_day = (date_range[0], date_range[-1]) if date_range else (first_day, last_day)
+    if (start_day, end_day) != (first_day, last_day):
+        window_start, window_end = day_window(start_day, end_day)
+    else:
+        end_day = None
+tables = tables.window(window_start, window_end)
+
+if ENGINE == 'duckdb':
+    panels = tables
+    try:
+        kpis = panels.kpis()
+        weekly_change = dataset.weekly_change(end_day)
+        n_accounts = dataset.count('accounts')
+    except DATA_ERRORS as exc:
+        stop_with_data_error(exc)
+    panel_rows = kpis['total_transactions']
+else:
+    cube = dataset.cube
+    kpis = dataset.kpis
+    if window_start is not None:
+        cube = cube_window(cube, window_start, window_end)
+        kpis = dataset.prefix.window_kpis(kpis, start_day, end_day)
+    panels = CubePanels(cube, dataset.customer_cube)
+    weekly_change = dataset.weekly.change(end_day)
+    n_accounts = len(dataset.accounts_df)
+    panel_rows = len(cube)
+profile.rows(panel_rows)
+
+# Format a week-over-week change for st.metric's delta
+def weekly_delta(change, unit='', label='weekly'):
+    if change is None:
+        return None
+    sign = '+' if change >= 0 else '-'
+    return f"{sign}{unit}{abs(change):,.0f} {label}"
 
 # Custom CSS for better styling
 st.markdown("""
@@ -148,21 +186,21 @@ with col1:
     st.metric(
         "Total Customers", 
         f"{kpis['total_customers']:,}",
-        f"+{int(kpis['total_customers'] * kpis['weekly_growth'])} weekly"
+        weekly_delta(weekly_change['customers'], label='active weekly')
     )
 
 with col2:
     st.metric(
         "Total Transactions", 
         f"{kpis['total_transactions']:,}",
-        f"+{int(kpis['total_transactions'] * kpis['weekly_growth'])} weekly"
+        weekly_delta(weekly_change['transactions'])
     )
 
 with col3:
     st.metric(
         "Total Volume", 
         f"${kpis['total_volume']:,.0f}",
-        f"+${int(kpis['total_volume'] * kpis['weekly_growth']):,} weekly"
+        weekly_delta(weekly_change['volume'], unit='$')
     )
 
 with col4:
@@ -182,20 +220,32 @@ with col6:
     st.metric("Avg Transaction", f"${kpis['avg_transaction_size']:.1f}")
 
 with col7:
-    st.metric("Active Accounts", f"{len(accounts_df):,}")
+    st.metric("Active Accounts", f"{n_accounts:,}")
 
 with col8:
     success_rate = 0.98  # Simulated success rate
     st.metric("Success Rate", f"{success_rate:.1%}")
 
+# Every panel's numbers in one aggregation pass over the pre-aggregated
+# cubes (or one query per panel with DuckDB), timed as its own step: the
+# sections below only render
+profile.begin("Aggregate panels")
+profile.rows(panel_rows)
+try:
+    results = panels.results()
+except DATA_ERRORS as exc:
+    stop_with_data_error(exc)
+
 # Transaction Analytics
+profile.begin("Transaction Analytics")
 st.markdown('<div class="section-header">📊 Transaction Analytics</div>', unsafe_allow_html=True)
 
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Transaction Types")
-    txn_types = transactions_df['transaction_type'].value_counts()
+    txn_types = results.transaction_types
+    profile.sent(txn_types)
     st.dataframe(
         txn_types.reset_index().rename(columns={'index': 'Type', 'transaction_type': 'Count'}),
         use_container_width=True
@@ -203,12 +253,14 @@ with col1:
     
     # Simple bar chart using st.bar_chart
     st.subheader("Transaction Volume by Type")
-    txn_volume = transactions_df.groupby('transaction_type')['amount_usd'].sum().sort_values(ascending=False)
+    txn_volume = results.volume_by_type
+    profile.sent(txn_volume)
     st.bar_chart(txn_volume)
 
 with col2:
     st.subheader("Channel Usage")
-    channel_usage = transactions_df['channel'].value_counts()
+    channel_usage = results.channel_usage
+    profile.sent(channel_usage)
     st.dataframe(
         channel_usage.reset_index().rename(columns={'index': 'Channel', 'channel': 'Count'}),
         use_container_width=True
@@ -217,120 +269,260 @@ with col2:
     # Channel distribution
     st.subheader("Transactions by Channel")
     st.bar_chart(channel_usage)
+    profile.sent(channel_usage)
 
 # Customer Analytics
+profile.begin("Customer Analytics")
 st.markdown('<div class="section-header">👥 Customer Analytics</div>', unsafe_allow_html=True)
 
 col3, col4 = st.columns(2)
 
 with col3:
     st.subheader("Customer Distribution by Region")
-    regional_dist = customers_df['region'].value_counts()
+    regional_dist = results.regional_dist
+    profile.sent(regional_dist)
     st.dataframe(
         regional_dist.reset_index().rename(columns={'index': 'Region', 'region': 'Count'}),
         use_container_width=True
     )
     st.bar_chart(regional_dist)
+    profile.sent(regional_dist)
 
 with col4:
     st.subheader("Customer Types")
-    customer_types = customers_df['customer_type'].value_counts()
+    customer_types = results.customer_types
+    profile.sent(customer_types)
     st.dataframe(
         customer_types.reset_index().rename(columns={'index': 'Type', 'customer_type': 'Count'}),
         use_container_width=True
     )
     
     st.subheader("Mobile Network Distribution")
-    network_dist = customers_df['mobile_network'].value_counts()
+    network_dist = results.network_dist
+    profile.sent(network_dist)
     st.dataframe(
         network_dist.reset_index().rename(columns={'index': 'Network', 'mobile_network': 'Count'}),
         use_container_width=True
     )
 
 # Daily Trends
+profile.begin("Daily Trends")
+profile.rows(len(results.daily_totals))
 st.markdown('<div class="section-header">📈 Daily Transaction Trends</div>', unsafe_allow_html=True)
 
-# Create daily volume data
-transactions_df['date'] = transactions_df['transaction_date'].dt.date
-daily_volume = transactions_df.groupby('date')['amount_usd'].sum().reset_index()
-daily_count = transactions_df.groupby('date')['transaction_id'].count().reset_index()
+# Volume and count per day, week or month: the per-day totals re-aggregated
+# through the day -> bucket maps shared by every rerun
+granularity = st.segmented_control(
+    "Granularity", GRANULARITIES, default="Day", key="trend_granularity"
+) or "Day"
+trend_totals = results.daily_totals
+if granularity != "Day" and len(trend_totals):
+    trend_totals = date_buckets(first_day, last_day).totals(trend_totals, granularity)
+period = {"Day": "Daily", "Week": "Weekly", "Month": "Monthly"}[granularity]
+
+# Each series is downsampled on its own, so both keep their own peaks
+trend_volume = downsample(trend_totals['amount_usd'], CHART_POINTS, CHART_DOWNSAMPLE)
+trend_count = downsample(trend_totals['count'], CHART_POINTS, CHART_DOWNSAMPLE)
+profile.sent(trend_volume)
+profile.sent(trend_count)
 
 col5, col6 = st.columns(2)
 
 with col5:
-    st.subheader("Daily Transaction Volume (USD)")
-    st.line_chart(daily_volume.set_index('date')['amount_usd'])
+    st.subheader(f"{period} Transaction Volume (USD)")
+    st.line_chart(trend_volume)
 
 with col6:
-    st.subheader("Daily Transaction Count")
-    st.line_chart(daily_count.set_index('date')['transaction_id'])
+    st.subheader(f"{period} Transaction Count")
+    st.line_chart(trend_count)
+
+if len(trend_totals) > CHART_POINTS:
+    st.caption(f"Charts show {CHART_POINTS:,} of {len(trend_totals):,} points ({CHART_DOWNSAMPLE} downsampling)")
+
+profile.end()
 
 # Data tables with filters
 st.markdown('<div class="section-header">📋 Detailed Data Views</div>', unsafe_allow_html=True)
 
-tab1, tab2, tab3 = st.tabs(["Customer Data", "Transaction Data", "Account Summary"])
-
-with tab1:
+# Download button whose file is only written when clicked (on a separate
+# thread) and reused for the same dataset, selection and format. The table
+# is written by the engine: in chunks from memory, or by DuckDB's COPY.
+def export_download(label, table, filters, key, file_stem, selection):
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key=f"{key}_format")
+    extension, mime = EXPORT_FORMATS[fmt]
+    export_key = (dataset_version, key, selection, fmt)
+    write = lambda path: tables.export(table, path, fmt, filters)
+    with col2:
+        st.download_button(
+            label,
+            data=lambda: export_cache.read(export_key, fmt, write),
+            file_name=file_stem + extension,
+            mime=mime,
+            key=f"{key}_download",
+            on_click="ignore",
+        )
+
+# Paginated table: only the visible page is gathered, formatted and sent to
+# the browser. In memory, sorting reorders positions, not rows; with DuckDB
+# the page is a LIMIT/OFFSET query.
+TABLE_PAGE_SIZES = [25, 50, 100, 500]
+
+def display_name(column):
+    return KEY_COLUMNS.get(column, CENTS_COLUMNS.get(column, column))
+
+def paginated_table(tables, table, key, filters=None):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox(
+            "Sort by", [None] + tables.columns(table), key=f"{key}_sort",
+            format_func=lambda col: "(unsorted)" if col is None else display_name(col)
+        )
+    with col2:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+    with col3:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, index=1, key=f"{key}_page_size")
+    
+    n_rows = tables.count(table, filters)
+    n_pages = page_count(n_rows, page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1
+    with col4:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, key=page_key)
+    
+    display = tables.page(table, page - 1, page_size, filters, sort_by, descending)
+    st.dataframe(display, use_container_width=True)
+    profile.rows(n_rows)
+    profile.sent(display)
+    first_row = (page - 1) * page_size + 1 if len(display) else 0
+    st.caption(f"Rows {first_row:,}–{first_row + len(display) - 1 if len(display) else 0:,} of {n_rows:,}")
+
+# Each tab is a fragment: its filters rerun only that tab, and only the open
+# tab runs at all (st.tabs with on_change="rerun" tracks the selection).
+# Only full reruns are profiled; a fragment rerun records nothing.
+@st.fragment
+def customer_data_tab(tables):
     st.subheader("Customer Database")
     
-    # Filters for customer data
+    # Filters for customer data (no selection means all)
     col1, col2, col3 = st.columns(3)
     with col1:
-        selected_region = st.selectbox("Filter by Region", ['All'] + list(customers_df['region'].unique()))
+        selected_regions = st.multiselect(
+            "Filter by Region", tables.values('customers', 'region'), placeholder="All"
+        )
     with col2:
-        selected_type = st.selectbox("Filter by Customer Type", ['All'] + list(customers_df['customer_type'].unique()))
+        selected_types = st.multiselect(
+            "Filter by Customer Type", tables.values('customers', 'customer_type'), placeholder="All"
+        )
     with col3:
-        selected_kyc = st.selectbox("Filter by KYC Status", ['All'] + list(customers_df['kyc_status'].unique()))
+        selected_kyc = st.multiselect(
+            "Filter by KYC Status", tables.values('customers', 'kyc_status'), placeholder="All"
+        )
     
-    filtered_customers = customers_df.copy()
-    if selected_region != 'All':
-        filtered_customers = filtered_customers[filtered_customers['region'] == selected_region]
-    if selected_type != 'All':
-        filtered_customers = filtered_customers[filtered_customers['customer_type'] == selected_type]
-    if selected_kyc != 'All':
-        filtered_customers = filtered_customers[filtered_customers['kyc_status'] == selected_kyc]
+    # Resolved on the bitmap index in memory, pushed down into the scan with DuckDB
+    filters = {
+        'region': selected_regions,
+        'customer_type': selected_types,
+        'kyc_status': selected_kyc,
+    }
     
-    st.dataframe(filtered_customers, use_container_width=True)
-    st.download_button(
-        "Download Customer Data",
-        filtered_customers.to_csv(index=False),
-        "innbucks_customers.csv",
-        "text/csv"
+    paginated_table(tables, 'customers', key="customers_table", filters=filters)
+    selection = (tuple(selected_regions), tuple(selected_types), tuple(selected_kyc))
+    export_download(
+        "Download Customer Data", 'customers', filters,
+        key="customers_export", file_stem="innbucks_customers", selection=selection
     )
 
-with tab2:
+RECENT_PAGE_SIZE = 100
+
+def set_recent_page(page):
+    st.session_state['recent_page'] = page
+
+@st.fragment
+def transaction_data_tab(tables, window_start, window_end):
     st.subheader("Recent Transactions")
     
     # Transaction filters
     col1, col2 = st.columns(2)
     with col1:
-        selected_txn_type = st.selectbox("Filter by Type", ['All'] + list(transactions_df['transaction_type'].unique()))
+        selected_txn_types = st.multiselect(
+            "Filter by Type", tables.values('transactions', 'transaction_type'), placeholder="All"
+        )
     with col2:
-        selected_channel = st.selectbox("Filter by Channel", ['All'] + list(transactions_df['channel'].unique()))
+        selected_channels = st.multiselect(
+            "Filter by Channel", tables.values('transactions', 'channel'), placeholder="All"
+        )
+    
+    filters = {'transaction_type': selected_txn_types, 'channel': selected_channels}
     
-    filtered_transactions = transactions_df.copy()
-    if selected_txn_type != 'All':
-        filtered_transactions = filtered_transactions[filtered_transactions['transaction_type'] == selected_txn_type]
-    if selected_channel != 'All':
-        filtered_transactions = filtered_transactions[filtered_transactions['channel'] == selected_channel]
+    # Page through the newest matches; in memory the store is already sorted
+    # by date, so no page ever sorts. Changing the filters or window returns
+    # to page 1.
+    page_key = (tuple(selected_txn_types), tuple(selected_channels), window_start, window_end)
+    if st.session_state.get('recent_page_key') != page_key:
+        st.session_state['recent_page_key'] = page_key
+        st.session_state['recent_page'] = 0
+    page = st.session_state['recent_page']
     
-    # Show recent transactions
-    recent_txns = filtered_transactions.sort_values('transaction_date', ascending=False).head(100)
+    # Fetch one extra row to know whether an older page exists
+    latest = tables.latest(RECENT_PAGE_SIZE + 1, page * RECENT_PAGE_SIZE, filters)
+    recent_txns = latest.iloc[:RECENT_PAGE_SIZE]
     st.dataframe(recent_txns, use_container_width=True)
+    profile.rows(len(latest))
+    profile.sent(recent_txns)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("← Newer", disabled=page == 0, on_click=set_recent_page, args=(page - 1,))
+    with col2:
+        first_row = page * RECENT_PAGE_SIZE + 1 if len(recent_txns) else 0
+        st.caption(f"Showing {first_row:,}–{page * RECENT_PAGE_SIZE + len(recent_txns):,}, newest first")
+    with col3:
+        st.button(
+            "Older →", disabled=len(latest) <= RECENT_PAGE_SIZE, on_click=set_recent_page, args=(page + 1,)
+        )
+    
+    # Export every matching transaction in the window
+    export_download(
+        "Download Transaction Data", 'transactions', filters,
+        key="transactions_export", file_stem="innbucks_transactions", selection=page_key
+    )
 
-with tab3:
+@st.fragment
+def account_summary_tab(tables):
     st.subheader("Account Summary")
     
-    # Merge customer and account data
-    account_summary = accounts_df.merge(customers_df, on='customer_id')
-    
-    st.metric("Total Accounts", len(account_summary))
-    st.metric("Average Balance", f"${account_summary['usd_balance'].mean():.2f}")
-    st.metric("Total Wallet Size", f"${account_summary['usd_balance'].sum():,.0f}")
+    # Customer and account data, joined once per dataset (or by DuckDB)
+    totals = tables.account_totals()
+    st.metric("Total Accounts", totals['n_accounts'])
+    st.metric("Average Balance", f"${totals['mean_balance_cents'] / 100:.2f}")
+    st.metric("Total Wallet Size", f"${totals['total_balance_cents'] / 100:,.0f}")
     
-    st.dataframe(account_summary, use_container_width=True)
+    paginated_table(tables, 'account_summary', key="accounts_table")
+
+tab1, tab2, tab3 = st.tabs(
+    ["Customer Data", "Transaction Data", "Account Summary"], key="data_view_tab", on_change="rerun"
+)
+
+with tab1:
+    if tab1.open:
+        with profile.section("Customer Data tab"):
+            customer_data_tab(tables)
+
+with tab2:
+    if tab2.open:
+        with profile.section("Transaction Data tab"):
+            transaction_data_tab(tables, window_start, window_end)
+
+with tab3:
+    if tab3.open:
+        with profile.section("Account Summary tab"):
+            account_summary_tab(tables)
 
 # System Alerts
+profile.begin("System Overview")
 st.markdown('<div class="section-header">🚨 System Overview</div>', unsafe_allow_html=True)
 
 col1, col2, col3, col4 = st.columns(4)
@@ -338,11 +530,17 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.success("🟢 System Normal")
 with col2:
-    st.info("📊 Data Updated")
+    st.info("📊 Data Updated " + datetime.datetime.fromtimestamp(dataset.built_at).strftime("%H:%M"))
+    if ENGINE != 'duckdb':
+        cache_stats = dataset_cache.stats()
+        st.caption(f"Data cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    else:
+        st.caption(f"Queried with {ENGINE}")
 with col3:
     st.warning("⚠️ 2 Pending KYC")
 with col4:
     st.success("✅ All Services Active")
+profile.end()
 
 # Footer
 st.markdown("---")
@@ -353,3 +551,24 @@ st.markdown(
     "</div>", 
     unsafe_allow_html=True
 )
+
+# Performance panel and log
+if PERF_LOG:
+    dump_json_lines(profile, PERF_LOG, source=DATA_SOURCE, n_customers=N_CUSTOMERS, days=DAYS)
+if show_perf:
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.caption(f"Last full rerun: {profile.total_seconds() * 1000:,.0f} ms")
+        timings = pd.DataFrame(profile.records, columns=['section', 'seconds', 'rows', 'payload_bytes'])
+        timings['ms'] = timings.pop('seconds') * 1000
+        st.dataframe(
+            timings[['section', 'ms', 'rows', 'payload_bytes']],
+            hide_index=True,
+            use_container_width=True,
+            column_config={'ms': st.column_config.NumberColumn(format="%.1f")}
+        )
+        st.download_button(
+            "Download timings (JSON lines)",
+            profile.json_lines(source=DATA_SOURCE, n_customers=N_CUSTOMERS, days=DAYS),
+            "innbucks_timings.jsonl",
+            "application/x-ndjson"
+        )
@@ -0,0 +1,44 @@
+# tests/conftest.py
+#
+# Small synthetic datasets with a fixed start date, and the ways real exports
+# differ from them: ids that reference missing rows, and enumerations with
+# missing values.
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from innbucks.data import generate_innbucks_data
+
+START_DATE = pd.Timestamp('2025-03-01')
+
+
+# (customers_df, accounts_df, transactions_df) as a data source returns them
+def string_frames(n_customers, seed=7, days=30):
+    return generate_innbucks_data(n_customers=n_customers, days=days, seed=seed, start_date=START_DATE)
+
+
+# Frames with every 10th customer and every 7th account dropped, so some
+# accounts point at unknown customers and some transactions at unknown
+# accounts
+def with_orphans(frames):
+    customers_df, accounts_df, transactions_df = frames
+    customers_df = customers_df[customers_df.index % 10 != 3].reset_index(drop=True)
+    accounts_df = accounts_df[accounts_df.index % 7 != 5].reset_index(drop=True)
+    return customers_df, accounts_df, transactions_df
+
+
+# Frames with some values of each enumeration missing, at a different stride
+# per column so customers miss one column but not the others
+def with_null_enums(frames):
+    customers_df, accounts_df, transactions_df = (df.copy() for df in frames)
+    for df, strides in [
+        (customers_df, {'region': 17, 'customer_type': 23, 'mobile_network': 10, 'kyc_status': 13}),
+        (transactions_df, {'transaction_type': 29, 'channel': 31}),
+    ]:
+        for col, stride in strides.items():
+            df[col] = df[col].astype(object)
+            df.loc[df.index % stride == 1, col] = None
+    return customers_df, accounts_df, transactions_df
@@ -0,0 +1,82 @@
+# tests/test_bitmap.py
+#
+# Bitmap index selections, masks, positions and counts against boolean
+# masks over the frame, and the filtered newest-transaction pages built on
+# them.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums
+from innbucks.bitmap import BitmapIndex
+from innbucks.compact import compact_frames
+from innbucks.store import TransactionStore
+
+FILTERS = [
+    {},
+    {'transaction_type': None, 'channel': []},
+    {'transaction_type': 'Bill Payment'},
+    {'transaction_type': ['Cash In', 'Cash Out'], 'channel': 'USSD'},
+    {'channel': ['Mobile App', 'No Such Channel']},
+    {'transaction_type': 'No Such Type'},
+]
+
+
+# Transactions with some transaction_type and channel values missing; a
+# missing value matches no filter
+def transactions():
+    return compact_frames(*with_null_enums(string_frames(300)))[2]
+
+
+def brute_force_mask(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, selected in filters.items():
+        if selected is None:
+            continue
+        selected = [selected] if isinstance(selected, str) else list(selected)
+        if selected:
+            mask &= df[col].astype(object).isin(selected).to_numpy()
+    return mask
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_select_matches_mask(filters):
+    df = transactions()
+    index = BitmapIndex(df, ['transaction_type', 'channel'])
+    bitset = index.select(filters)
+    expected = brute_force_mask(df, filters)
+    assert (bitset is None) == (not any(filters.values()))
+    assert (index.mask(bitset) == expected).all()
+
+    n = len(df)
+    for lo, hi in [(0, n), (3, n - 5), (8, 16), (9, 17), (13, 14), (n // 2, n // 2), (n, n)]:
+        assert (index.positions(bitset, lo, hi) == lo + np.flatnonzero(expected[lo:hi])).all()
+        assert index.count(bitset, lo, hi) == expected[lo:hi].sum()
+
+
+def test_values_leave_out_missing():
+    df = transactions()
+    index = BitmapIndex(df, ['channel'])
+    assert df['channel'].isna().any()
+    assert sorted(index.values('channel')) == ['Agent', 'Mobile App', 'USSD']
+
+
+def test_string_columns_are_indexed():
+    df = pd.DataFrame({'region': ['Harare', 'Gweru', None, 'Harare']})
+    index = BitmapIndex(df, ['region'])
+    assert list(index.positions(index.select({'region': 'Harare'}))) == [0, 3]
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+@pytest.mark.parametrize('start, end', [(None, None), ('2025-03-05', '2025-03-12'), ('2025-05-01', None)])
+def test_filtered_latest_matches_mask(filters, start, end):
+    store = TransactionStore(transactions())
+    df = store.transactions_df
+    lo, hi = store.bounds(start, end)
+    mask = brute_force_mask(df, filters)
+    mask[:lo] = mask[hi:] = False
+    newest_first = np.flatnonzero(mask)[::-1]
+
+    for n, offset in [(10, 0), (25, 40), (5000, 0), (10, len(df))]:
+        latest = store.latest(n, offset, filters, start, end)
+        assert (latest.index.to_numpy() == newest_first[offset:offset + n]).all()
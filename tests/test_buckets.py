@@ -0,0 +1,47 @@
+# tests/test_buckets.py
+#
+# Day, week and month buckets against pandas periods, and bucket totals
+# against a groupby of the per-day totals.
+import numpy as np
+import pandas as pd
+import pytest
+
+from innbucks.buckets import DateBuckets, date_buckets, floor_days
+
+DAYS = pd.date_range('2023-12-20', '2025-03-10', freq='D')
+
+
+@pytest.mark.parametrize('granularity, freq', [('Day', 'D'), ('Week', 'W-SUN'), ('Month', 'M')])
+def test_floor_days_match_periods(granularity, freq):
+    starts = floor_days(DAYS.to_numpy(), granularity)
+    expected = DAYS.to_period(freq).start_time.to_numpy().astype('datetime64[D]')
+    assert (starts == expected).all()
+    if granularity == 'Week':
+        assert (pd.DatetimeIndex(starts).dayofweek == 0).all()
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError, match='Year'):
+        floor_days(DAYS.to_numpy(), 'Year')
+
+
+@pytest.mark.parametrize('granularity, freq', [('Day', 'D'), ('Week', 'W-SUN'), ('Month', 'M')])
+def test_totals_match_groupby(granularity, freq):
+    rng = np.random.default_rng(3)
+    # Days with no transactions are missing from daily_totals
+    days = DAYS[rng.random(len(DAYS)) < 0.8]
+    daily = pd.DataFrame(
+        {'amount_usd': rng.integers(0, 10**7, len(days)) / 100, 'count': rng.integers(0, 500, len(days))},
+        index=pd.Index(days, name='date'),
+    )
+    totals = DateBuckets(DAYS[0], DAYS[-1]).totals(daily, granularity)
+
+    grouped = daily.groupby(daily.index.to_period(freq).start_time)
+    expected_cents = grouped['amount_usd'].apply(lambda usd: np.rint(usd * 100).sum())
+    assert list(totals.index) == list(expected_cents.index)
+    assert (totals['count'].to_numpy() == grouped['count'].sum().to_numpy()).all()
+    assert (np.rint(totals['amount_usd'].to_numpy() * 100) == expected_cents.to_numpy()).all()
+
+
+def test_date_buckets_are_shared():
+    assert date_buckets(DAYS[0].date(), DAYS[-1].date()) is date_buckets(DAYS[0].date(), DAYS[-1].date())
@@ -0,0 +1,57 @@
+# tests/test_cache.py
+#
+# DatasetCache: one build per parameter set, shared by concurrent callers,
+# rebuilt once the TTL has passed or after invalidate().
+import threading
+import time
+
+from innbucks.cache import DatasetCache
+
+
+class Builder:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, **params):
+        self.calls.append(params)
+        time.sleep(self.delay)
+        return object()
+
+
+def test_hits_and_misses():
+    builder = Builder()
+    cache = DatasetCache(builder)
+    first = cache.get(n_customers=10, seed=1)
+    assert cache.get(seed=1, n_customers=10) is first
+    assert cache.get(n_customers=10, seed=2) is not first
+    assert builder.calls == [{'n_customers': 10, 'seed': 1}, {'n_customers': 10, 'seed': 2}]
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 2}
+
+
+def test_concurrent_requests_share_one_build():
+    builder = Builder(delay=0.2)
+    cache = DatasetCache(builder)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(n_customers=10))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builder.calls) == 1
+    assert len(set(map(id, results))) == 1
+
+
+def test_ttl_and_invalidate():
+    now = [0.0]
+    builder = Builder()
+    cache = DatasetCache(builder, ttl=60, clock=lambda: now[0])
+    first = cache.get(n_customers=10)
+    now[0] = 59
+    assert cache.get(n_customers=10) is first
+    now[0] = 61
+    second = cache.get(n_customers=10)
+    assert second is not first
+    cache.invalidate(n_customers=10)
+    assert cache.get(n_customers=10) is not second
+    assert len(builder.calls) == 3
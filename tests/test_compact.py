@@ -0,0 +1,61 @@
+# tests/test_compact.py
+#
+# The compact layout converts back to the frames it was built from: keys
+# through the id codecs, cents to dollars, categories to their labels.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums, with_orphans
+from innbucks.compact import compact_frames
+from innbucks.data import generate_compact_data, string_frame
+
+
+def assert_same_values(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    for col in expected.columns:
+        left, right = actual[col].astype(object), expected[col].astype(object)
+        assert (left.isna() == right.isna()).all(), col
+        assert (left[left.notna()] == right[right.notna()]).all(), col
+
+
+@pytest.mark.parametrize('transform', [lambda frames: frames, with_null_enums])
+def test_compact_frames_round_trip(transform):
+    frames = transform(string_frames(200))
+    customers_df, accounts_df, transactions_df, ids = compact_frames(*frames)
+    assert customers_df['customer_key'].dtype == 'int32'
+    assert transactions_df['amount_cents'].dtype == 'int64'
+    assert isinstance(transactions_df['channel'].dtype, pd.CategoricalDtype)
+    for compact, original in zip((customers_df, accounts_df, transactions_df), frames):
+        assert_same_values(string_frame(compact, ids), original)
+
+
+def test_unknown_ids_get_key_minus_one():
+    frames = with_orphans(string_frames(200))
+    customers_df, accounts_df, transactions_df = frames
+    _, compact_accounts, compact_transactions, _ = compact_frames(*frames)
+
+    known_customer = accounts_df['customer_id'].isin(customers_df['customer_id']).to_numpy()
+    assert ((compact_accounts['customer_key'] >= 0).to_numpy() == known_customer).all()
+    known_account = transactions_df['account_id'].isin(accounts_df['account_id']).to_numpy()
+    assert ((compact_transactions['account_key'] >= 0).to_numpy() == known_account).all()
+    assert not known_account.all()
+
+
+def test_duplicate_ids_are_rejected():
+    customers_df, accounts_df, transactions_df = string_frames(20)
+    customers_df = pd.concat([customers_df, customers_df.iloc[:1]], ignore_index=True)
+    with pytest.raises(ValueError, match='customer_id'):
+        compact_frames(customers_df, accounts_df, transactions_df)
+
+
+def test_synthetic_ids_match_generated_ids():
+    customers_df, accounts_df, transactions_df, ids = generate_compact_data(300, seed=3)
+    keys = transactions_df['transaction_key'].to_numpy()
+    labels = ids.transaction_ids(keys)
+    assert labels.is_unique
+    # Transaction i of an account is TXN + the account id + i
+    owners = ids.account_ids(transactions_df['account_key'])
+    assert all(label.startswith('TXN' + owner) for label, owner in zip(labels, owners))
+    first = np.flatnonzero(np.diff(transactions_df['account_key'].to_numpy(), prepend=-1))
+    assert (labels.iloc[first] == 'TXN' + owners.iloc[first] + '0').all()
@@ -0,0 +1,147 @@
+# tests/test_cube.py
+#
+# The cubes and the panel numbers read from them, against plain pandas over
+# the joined string frames.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums, with_orphans
+from innbucks.compact import compact_frames
+from innbucks.cube import (
+    CUBE_DIMENSIONS, CUSTOMER_DIMENSIONS, UNKNOWN, _grouped, aggregate_panels, build_customer_cube, build_daily_cube,
+    cube_kpis, cube_window,
+)
+from innbucks.data import calculate_kpis
+
+FRAMES = {
+    'complete': lambda: string_frames(300),
+    'orphans': lambda: with_orphans(string_frames(300)),
+    'null enums': lambda: with_null_enums(string_frames(300)),
+    'empty': lambda: string_frames(0),
+}
+
+
+# Transactions with their account's customer's region and customer_type;
+# these and the transaction enumerations are UNKNOWN where missing
+def denormalized(customers_df, accounts_df, transactions_df):
+    joined = transactions_df.merge(accounts_df[['account_id', 'customer_id']], on='account_id', how='left')
+    joined = joined.merge(customers_df[['customer_id', 'region', 'customer_type']], on='customer_id', how='left')
+    for col in CUBE_DIMENSIONS[1:]:
+        joined[col] = joined[col].astype(object).fillna(UNKNOWN)
+    joined['date'] = joined['transaction_date'].dt.normalize()
+    joined['amount_cents'] = np.rint(joined['amount_usd'] * 100).astype('int64')
+    return joined
+
+
+def cube_cells(cube):
+    cube = cube.astype({col: str for col in CUBE_DIMENSIONS[1:]})
+    rows = cube[CUBE_DIMENSIONS + ['count', 'amount_cents']].itertuples(index=False)
+    return {tuple(row[:-2]): tuple(row[-2:]) for row in rows}
+
+
+def expected_cells(joined):
+    grouped = joined.groupby(CUBE_DIMENSIONS)['amount_cents'].agg(['size', 'sum'])
+    return {key: (size, cents) for key, size, cents in grouped.itertuples()}
+
+
+@pytest.mark.parametrize('kind', FRAMES)
+def test_daily_cube_matches_groupby(kind):
+    frames = FRAMES[kind]()
+    cube = build_daily_cube(*compact_frames(*frames)[:3])
+    assert cube_cells(cube) == expected_cells(denormalized(*frames))
+    assert cube['date'].is_monotonic_increasing
+
+
+def test_unknown_ids_are_grouped_as_unknown():
+    frames = with_orphans(string_frames(300))
+    cube = build_daily_cube(*compact_frames(*frames)[:3])
+    unknown = cube.loc[cube['region'] == UNKNOWN, 'count'].sum()
+    assert unknown > 0
+    assert unknown == (denormalized(*frames)['region'] == UNKNOWN).sum()
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2025-03-05', '2025-03-12'),
+    ('2025-03-05 12:00', '2025-03-06'),
+    (None, '2025-03-03'),
+    ('2025-03-29', None),
+    ('2025-04-10', '2025-04-20'),
+])
+def test_cube_window_matches_date_filter(start, end):
+    frames = string_frames(300)
+    cube = build_daily_cube(*compact_frames(*frames)[:3])
+    joined = denormalized(*frames)
+    # The window is on whole days: the cube holds no time of day
+    if start is not None:
+        joined = joined[joined['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        joined = joined[joined['date'] < pd.Timestamp(end)]
+    assert cube_cells(cube_window(cube, start, end)) == expected_cells(joined)
+
+
+def test_customer_cube_keeps_customers_missing_a_dimension():
+    customers_df = compact_frames(*with_null_enums(string_frames(300)))[0]
+    customer_cube = build_customer_cube(customers_df)
+    assert customer_cube['count'].sum() == len(customers_df)
+    for col in CUSTOMER_DIMENSIONS:
+        assert isinstance(customer_cube[col].dtype, pd.CategoricalDtype)
+        counts = customer_cube.groupby(col, observed=True, dropna=False)['count'].sum()
+        expected = customers_df[col].value_counts(dropna=False)
+        assert counts.to_dict() == expected[expected > 0].to_dict(), col
+
+
+# A panel series as {label: value}, after checking it is largest first
+def as_dict(series):
+    values = series.to_numpy()
+    assert (values[1:] <= values[:-1]).all()
+    return {str(label): value for label, value in series.items()}
+
+
+@pytest.mark.parametrize('kind', FRAMES)
+@pytest.mark.parametrize('window', [(None, None), ('2025-03-05', '2025-03-12')])
+def test_aggregate_panels_match_value_counts(kind, window):
+    frames = FRAMES[kind]()
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*frames)
+    cube = cube_window(build_daily_cube(customers_df, accounts_df, transactions_df), *window)
+    results = aggregate_panels(cube, build_customer_cube(customers_df))
+
+    joined = denormalized(*frames)
+    start, end = window
+    if start is not None:
+        joined = joined[(joined['date'] >= pd.Timestamp(start)) & (joined['date'] < pd.Timestamp(end))]
+    customers = frames[0]
+    assert as_dict(results.transaction_types) == joined['transaction_type'].value_counts().to_dict()
+    assert as_dict(results.volume_by_type) == pytest.approx(
+        (joined.groupby('transaction_type')['amount_cents'].sum() / 100).to_dict()
+    )
+    assert as_dict(results.channel_usage) == joined['channel'].value_counts().to_dict()
+    # Each customer panel leaves out only the customers missing its own column
+    assert as_dict(results.regional_dist) == customers['region'].value_counts().to_dict()
+    assert as_dict(results.customer_types) == customers['customer_type'].value_counts().to_dict()
+    assert as_dict(results.network_dist) == customers['mobile_network'].value_counts().to_dict()
+
+    daily = results.daily_totals
+    assert daily['count'].to_dict() == joined.groupby('date').size().to_dict()
+    assert daily['amount_usd'].to_dict() == pytest.approx(
+        (joined.groupby('date')['amount_cents'].sum() / 100).to_dict()
+    )
+
+
+@pytest.mark.parametrize('kind', FRAMES)
+def test_cube_kpis_match_calculate_kpis(kind):
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*FRAMES[kind]())
+    cube = build_daily_cube(customers_df, accounts_df, transactions_df)
+    kpis = cube_kpis(cube, build_customer_cube(customers_df), customers_df, accounts_df)
+    expected = calculate_kpis(customers_df, accounts_df, transactions_df)
+    assert kpis.keys() == expected.keys()
+    for key, value in expected.items():
+        assert kpis[key] == pytest.approx(value, nan_ok=True), key
+
+
+def test_grouped_leaves_out_missing_values():
+    values = pd.Series(pd.Categorical(['a', None, 'b', 'a', None], categories=['a', 'b', 'c']), name='v')
+    series = _grouped(values, None, 'count')
+    assert series.to_dict() == {'a': 2, 'b': 1}
+    weights = np.array([1, 100, 2, 3, 100])
+    assert _grouped(values, weights, 'amount_usd', scale=100).to_dict() == {'a': 0.04, 'b': 0.02}
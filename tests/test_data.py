@@ -0,0 +1,72 @@
+# tests/test_data.py
+#
+# The vectorized generator: reproducible for a seed, and shaped like the
+# original row-by-row data (one account per customer, transactions inside the
+# period, values from the reference lists).
+import numpy as np
+import pandas as pd
+
+from conftest import START_DATE, string_frames
+from innbucks import data
+
+
+def test_same_seed_same_data():
+    for first, second in zip(string_frames(300, seed=5), string_frames(300, seed=5)):
+        pd.testing.assert_frame_equal(first, second)
+    assert not string_frames(300, seed=5)[2].equals(string_frames(300, seed=6)[2])
+
+
+def test_shape_and_values():
+    customers_df, accounts_df, transactions_df = string_frames(500, days=10)
+
+    assert customers_df['customer_id'].is_unique
+    assert (accounts_df['customer_id'] == customers_df['customer_id']).all()
+    assert accounts_df['account_id'].is_unique
+    assert (accounts_df['usd_balance'] >= 10).all()
+
+    assert transactions_df['transaction_id'].is_unique
+    assert transactions_df['account_id'].isin(accounts_df['account_id']).all()
+    dates = transactions_df['transaction_date']
+    assert dates.min() >= START_DATE and dates.max() < START_DATE + pd.Timedelta(days=10)
+    assert (transactions_df['amount_usd'] > 0).all()
+    assert np.allclose(transactions_df['amount_usd'] * 100, np.rint(transactions_df['amount_usd'] * 100))
+
+    for df, col, values in [
+        (customers_df, 'customer_type', data.CUSTOMER_TYPES),
+        (customers_df, 'region', data.REGIONS),
+        (customers_df, 'mobile_network', data.MOBILE_NETWORKS),
+        (customers_df, 'kyc_status', data.KYC_STATUSES),
+        (transactions_df, 'transaction_type', data.TRANSACTION_TYPES),
+        (transactions_df, 'channel', data.CHANNELS),
+    ]:
+        assert set(df[col]) == set(values), col
+
+
+def test_no_customers():
+    customers_df, accounts_df, transactions_df = string_frames(0)
+    assert len(customers_df) == len(accounts_df) == len(transactions_df) == 0
+    assert 'customer_id' in customers_df and 'transaction_id' in transactions_df
+
+
+def test_shard_sizes():
+    assert data.shard_sizes(0) == [0]
+    assert data.shard_sizes(250, shard_customers=100) == [100, 100, 50]
+    assert data.shard_sizes(200, shard_customers=100) == [100, 100]
+
+
+# Codes of a categorical column, values of any other: assert_frame_equal
+# takes seconds per categorical column at a full shard
+def _raw(column):
+    return column.cat.codes.to_numpy() if isinstance(column.dtype, pd.CategoricalDtype) else column.to_numpy()
+
+
+def test_same_data_for_any_number_of_workers():
+    # Just over one shard, so the second shard is a single customer
+    n_customers = data.SHARD_CUSTOMERS + 1
+    serial = data.generate_compact_data(n_customers, days=1, seed=3, start_date=START_DATE, workers=1)
+    pooled = data.generate_compact_data(n_customers, days=1, seed=3, start_date=START_DATE, workers=2)
+    for first, second in zip(serial[:3], pooled[:3]):
+        assert first.dtypes.equals(second.dtypes)
+        for col in first:
+            assert np.array_equal(_raw(first[col]), _raw(second[col])), col
+    assert len(serial[0]) == n_customers
@@ -0,0 +1,55 @@
+# tests/test_downsample.py
+#
+# Both downsampling methods stay within the point budget, keep the points
+# a chart reader would miss, and leave short series alone.
+import numpy as np
+import pandas as pd
+import pytest
+
+from innbucks.downsample import METHODS, downsample
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(11)
+    index = pd.date_range('2022-01-01', periods=2000, freq='D')
+    return pd.Series(rng.normal(0, 1, len(index)).cumsum(), index=index)
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('max_points', [3, 10, 365, 1999])
+def test_budget_and_order(series, method, max_points):
+    result = downsample(series, max_points, method)
+    assert 0 < len(result) <= max_points
+    assert result.index.is_monotonic_increasing and result.index.is_unique
+    assert (series.loc[result.index] == result).all()
+
+
+@pytest.mark.parametrize('max_points', [3, 10, 365])
+def test_lttb_keeps_endpoints(series, max_points):
+    result = downsample(series, max_points, 'lttb')
+    assert len(result) == max_points
+    assert result.index[0] == series.index[0] and result.index[-1] == series.index[-1]
+
+
+@pytest.mark.parametrize('max_points', [2, 10, 365])
+def test_minmax_keeps_extremes(series, max_points):
+    result = downsample(series, max_points, 'minmax')
+    assert result.max() == series.max() and result.min() == series.min()
+
+
+def test_lttb_on_a_positional_index(series):
+    result = downsample(series.reset_index(drop=True), 50, 'lttb')
+    assert len(result) == 50 and result.index[0] == 0 and result.index[-1] == len(series) - 1
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_short_series_unchanged(series, method):
+    short = series.iloc[:100]
+    assert downsample(short, 100, method) is short
+    assert downsample(series, None, method) is series
+
+
+def test_unknown_method(series):
+    with pytest.raises(ValueError, match='lttb, minmax'):
+        downsample(series, 10, 'mean')
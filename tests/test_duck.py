@@ -0,0 +1,145 @@
+# tests/test_duck.py
+#
+# The DuckDB engine against the in-memory dataset over the same Parquet
+# export: every KPI card, panel, count and table the app shows from either
+# engine must agree.
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums, with_orphans
+from innbucks.cache import build_dataset
+from innbucks.cube import CubePanels, cube_window
+from innbucks.duck import DuckDBQueries
+from innbucks.sources import TABLES, SchemaError
+from innbucks.store import day_window
+from innbucks.table import DatasetTables
+
+FRAMES = {
+    'complete': lambda: string_frames(300, days=40),
+    'orphans': lambda: with_orphans(string_frames(300, days=40)),
+    'null enums': lambda: with_null_enums(string_frames(300, days=40)),
+    'empty': lambda: string_frames(0),
+}
+WINDOWS = [(None, None), ('2025-03-05', '2025-03-12')]
+
+
+@pytest.fixture(scope='module', params=FRAMES)
+def engines(request, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('parquet')
+    for name, df in zip(TABLES, FRAMES[request.param]()):
+        df.to_parquet(directory / f'{name}.parquet')
+    return build_dataset(f'parquet:{directory}'), DuckDBQueries(str(directory))
+
+
+# The in-memory KPIs and panels for whole days start_day..end_day, as the app
+# computes them
+def memory_view(dataset, start_day, end_day):
+    if start_day is None:
+        return dataset.kpis, CubePanels(dataset.cube, dataset.customer_cube).results()
+    start, end = day_window(start_day, end_day)
+    kpis = dataset.prefix.window_kpis(dataset.kpis, start_day, end_day)
+    return kpis, CubePanels(cube_window(dataset.cube, start, end), dataset.customer_cube).results()
+
+
+def duck_window(queries, start_day, end_day):
+    return queries if start_day is None else queries.window(*day_window(start_day, end_day))
+
+
+def as_dict(series):
+    return {str(label): value for label, value in series.items()}
+
+
+@pytest.mark.parametrize('start_day, end_day', WINDOWS)
+def test_kpis_match(engines, start_day, end_day):
+    dataset, queries = engines
+    expected, _ = memory_view(dataset, start_day, end_day)
+    actual = duck_window(queries, start_day, end_day).kpis()
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, nan_ok=True), key
+
+
+@pytest.mark.parametrize('start_day, end_day', WINDOWS)
+def test_panels_match(engines, start_day, end_day):
+    dataset, queries = engines
+    _, expected = memory_view(dataset, start_day, end_day)
+    actual = duck_window(queries, start_day, end_day).results()
+    for field in ['transaction_types', 'channel_usage', 'regional_dist', 'customer_types', 'network_dist']:
+        assert as_dict(getattr(actual, field)) == as_dict(getattr(expected, field)), field
+    assert as_dict(actual.volume_by_type) == pytest.approx(as_dict(expected.volume_by_type))
+    assert actual.daily_totals['count'].to_dict() == expected.daily_totals['count'].to_dict()
+    assert actual.daily_totals['amount_usd'].to_dict() == pytest.approx(expected.daily_totals['amount_usd'].to_dict())
+
+
+@pytest.mark.parametrize('end_date', [None, '2025-04-02', '2025-03-20', '2025-03-05'])
+def test_weekly_change_matches(engines, end_date):
+    dataset, queries = engines
+    expected = dataset.weekly.change(end_date)
+    actual = queries.weekly_change(end_date)
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == (None if value is None else pytest.approx(value)), key
+
+
+@pytest.mark.parametrize('table, filters', [
+    ('customers', {}),
+    ('customers', {'region': ['Harare', 'Midlands'], 'kyc_status': 'Verified'}),
+    ('transactions', {}),
+    ('transactions', {'channel': 'USSD', 'transaction_type': ['Cash In', 'Airtime']}),
+    ('account_summary', {}),
+])
+@pytest.mark.parametrize('window', [(None, None), ('2025-03-05', '2025-03-12 06:00')])
+def test_tables_match(engines, table, filters, window):
+    dataset, queries = engines
+    tables = DatasetTables(dataset).window(*window)
+    queries = queries.window(*window)
+    id_column = {'customers': 'customer_id', 'transactions': 'transaction_id', 'account_summary': 'account_id'}[table]
+
+    n_rows = tables.count(table, filters)
+    assert queries.count(table, filters) == n_rows
+    expected = tables.page(table, 0, n_rows + 1, filters)
+    actual = queries.page(table, 0, n_rows + 1, filters)
+    assert sorted(actual[id_column]) == sorted(expected[id_column])
+    # Filter options
+    index = {'customers': dataset.customer_index, 'transactions': dataset.store.index}.get(table)
+    for col in index.columns if index is not None else []:
+        assert queries.values(table, col) == sorted(tables.values(table, col)), col
+
+
+def test_latest_and_account_totals_match(engines):
+    dataset, queries = engines
+    tables = DatasetTables(dataset)
+    for offset in [0, 30]:
+        expected = tables.latest(25, offset, {'channel': 'Mobile App'})
+        actual = queries.latest(25, offset, {'channel': 'Mobile App'})
+        assert list(actual['transaction_date']) == list(expected['transaction_date'])
+
+    expected, actual = tables.account_totals(), queries.account_totals()
+    assert actual['n_accounts'] == expected['n_accounts']
+    assert actual['total_balance_cents'] == expected['total_balance_cents']
+    assert (math.isnan(actual['mean_balance_cents']) and math.isnan(expected['mean_balance_cents'])
+            or actual['mean_balance_cents'] == pytest.approx(expected['mean_balance_cents']))
+
+
+# A partition whose footer is intact but whose data pages are not: the views
+# are created, and the error only surfaces when a query scans the pages
+def test_corrupt_partition_is_a_schema_error(tmp_path):
+    customers_df, accounts_df, transactions_df = string_frames(50)
+    customers_df.to_parquet(tmp_path / 'customers.parquet')
+    accounts_df.to_parquet(tmp_path / 'accounts.parquet')
+    (tmp_path / 'transactions').mkdir()
+    transactions_df.to_parquet(tmp_path / 'transactions' / 'part-0.parquet')
+    corrupt = tmp_path / 'transactions' / 'part-1.parquet'
+    transactions_df.to_parquet(corrupt, compression=None)
+    data = bytearray(corrupt.read_bytes())
+    data[8:len(data) * 3 // 4] = random.Random(1).randbytes(len(data) * 3 // 4 - 8)
+    corrupt.write_bytes(bytes(data))
+
+    queries = DuckDBQueries(str(tmp_path))
+    with pytest.raises(SchemaError):
+        queries.kpis()
+    with pytest.raises(SchemaError):
+        queries.results()
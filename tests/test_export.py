@@ -0,0 +1,116 @@
+# tests/test_export.py
+#
+# Chunked exports hold the same rows as the display frame, and the export
+# cache writes each key once, evicts the least recently used files and never
+# removes a file a reader still holds.
+import gzip
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums
+from innbucks import export
+from innbucks.compact import compact_frames, expand_frame
+from innbucks.export import ExportCache, write_export
+
+
+def read_back(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    opener = gzip.open if fmt == 'csv.gz' else open
+    with opener(path, 'rt') as f:
+        return pd.read_csv(f)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'parquet'])
+@pytest.mark.parametrize('n_customers', [0, 200])
+def test_chunked_export_matches_display_frame(tmp_path, fmt, n_customers):
+    customers_df, _, transactions_df, ids = compact_frames(*with_null_enums(string_frames(n_customers)))
+    path = str(tmp_path / f'transactions.{fmt}')
+    write_export(transactions_df, ids, fmt, path, chunk_rows=97)
+
+    expected = expand_frame(transactions_df, ids)
+    actual = read_back(path, fmt)
+    assert list(actual.columns) == list(expected.columns)
+    assert len(actual) == len(expected)
+    for col in ['transaction_id', 'account_id', 'transaction_type', 'channel']:
+        left, right = actual[col].astype(object), expected[col].astype(object)
+        assert (left.isna().to_numpy() == right.isna().to_numpy()).all(), col
+        assert (left.dropna().astype(str).to_numpy() == right.dropna().astype(str).to_numpy()).all(), col
+    assert (actual['amount_usd'].to_numpy() == expected['amount_usd'].to_numpy()).all()
+
+
+def test_unknown_format(tmp_path):
+    customers_df, _, _, ids = compact_frames(*string_frames(10))
+    with pytest.raises(ValueError, match='xlsx'):
+        write_export(customers_df, ids, 'xlsx', str(tmp_path / 'customers.xlsx'))
+
+
+def writer(text, calls, delay=0):
+    def write(path):
+        calls.append(path)
+        time.sleep(delay)
+        with open(path, 'w') as f:
+            f.write(text)
+    return write
+
+
+def test_concurrent_reads_share_one_write(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    calls, results = [], []
+    write = writer('a,b\n1,2\n', calls, delay=0.2)
+    threads = [threading.Thread(target=lambda: results.append(cache.read('k', 'csv', write))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [b'a,b\n1,2\n'] * 6
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = ExportCache(str(tmp_path), max_entries=2)
+    written = []
+    for key in ['a', 'b', 'a', 'c', 'b']:
+        assert cache.read(key, 'csv', writer(key, written)) == key.encode()
+    # 'b' was the least recently used when 'c' came in, so it is written
+    # again, evicting 'a'
+    assert len(written) == 4
+    assert len(list(tmp_path.iterdir())) == 2
+    assert set(cache._key_locks) <= {'b', 'c'}
+
+
+def test_eviction_waits_for_readers(tmp_path, monkeypatch):
+    cache = ExportCache(str(tmp_path), max_entries=1)
+    cache.read('a', 'csv', writer('first', []))
+
+    # Evict 'a' after read() has found its file but before it opens it
+    real_open = open
+    evicted = []
+
+    def open_after_eviction(path, mode='r', *args, **kwargs):
+        if mode == 'rb' and not evicted:
+            evicted.append(path)
+            cache.read('b', 'csv', writer('second', []))
+        return real_open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(export, 'open', open_after_eviction, raising=False)
+    assert cache.read('a', 'csv', writer('unused', [])) == b'first'
+    # Removed once the reader let go
+    assert not any(p == evicted[0] for p in map(str, tmp_path.iterdir()))
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_failed_write_leaves_nothing(tmp_path):
+    cache = ExportCache(str(tmp_path))
+
+    def fail(path):
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        cache.read('k', 'csv', fail)
+    assert list(tmp_path.iterdir()) == []
+    assert cache._key_locks == {}
+    assert cache.read('k', 'csv', writer('ok', [])) == b'ok'
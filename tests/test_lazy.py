@@ -0,0 +1,47 @@
+# tests/test_lazy.py
+#
+# The Polars aggregation pass against the pandas one: the same KPIs and the
+# same cubes, row for row, so everything built on them is unchanged.
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums, with_orphans
+from innbucks import lazy
+from innbucks.compact import compact_frames
+from innbucks.cube import aggregate_panels, build_customer_cube, build_daily_cube
+from innbucks.data import calculate_kpis
+
+FRAMES = {
+    'complete': lambda: string_frames(300),
+    'orphans': lambda: with_orphans(string_frames(300)),
+    'null enums': lambda: with_null_enums(string_frames(300)),
+    'empty': lambda: string_frames(0),
+}
+
+
+@pytest.mark.parametrize('kind', FRAMES)
+def test_aggregate_matches_pandas(kind):
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*FRAMES[kind]())
+    kpis, cube, customer_cube = lazy.aggregate(customers_df, accounts_df, transactions_df)
+
+    expected_kpis = calculate_kpis(customers_df, accounts_df, transactions_df)
+    assert kpis.keys() == expected_kpis.keys()
+    for key, value in expected_kpis.items():
+        assert kpis[key] == pytest.approx(value, nan_ok=True), key
+    assert lazy.calculate_kpis(customers_df, accounts_df, transactions_df) == pytest.approx(kpis, nan_ok=True)
+
+    expected_cube = build_daily_cube(customers_df, accounts_df, transactions_df)
+    pd.testing.assert_frame_equal(cube.astype(expected_cube.dtypes), expected_cube)
+
+    expected_customer_cube = build_customer_cube(customers_df)
+    pd.testing.assert_frame_equal(customer_cube, expected_customer_cube)
+
+    # And so the same panels (with no data, an empty index may be typed
+    # differently)
+    results = aggregate_panels(cube, customer_cube)
+    expected_results = aggregate_panels(expected_cube, expected_customer_cube)
+    for actual, expected in zip(results, expected_results):
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(actual, expected, check_index_type=kind != 'empty')
+        else:
+            pd.testing.assert_frame_equal(actual, expected)
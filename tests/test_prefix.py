@@ -0,0 +1,49 @@
+# tests/test_prefix.py
+#
+# Windowed KPIs from the per-day prefix sums against calculate_kpis() over
+# the transactions in the window.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import string_frames
+from innbucks.compact import compact_frames
+from innbucks.cube import build_daily_cube
+from innbucks.data import calculate_kpis
+from innbucks.prefix import DailyPrefixSums
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    (None, None),
+    ('2025-03-01', '2025-03-01'),
+    ('2025-03-05', '2025-03-12'),
+    ('2025-02-01', '2025-03-03'),
+    ('2025-03-28', '2025-04-30'),
+    ('2025-05-01', '2025-05-10'),
+    ('2025-03-10', '2025-03-05'),
+])
+def test_window_kpis_match_calculate_kpis(start_date, end_date):
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*string_frames(300))
+    prefix = DailyPrefixSums(build_daily_cube(customers_df, accounts_df, transactions_df))
+    kpis = calculate_kpis(customers_df, accounts_df, transactions_df)
+
+    day = transactions_df['transaction_date'].dt.normalize()
+    in_window = pd.Series(True, index=transactions_df.index)
+    if start_date is not None:
+        in_window &= day >= pd.Timestamp(start_date)
+    if end_date is not None:
+        in_window &= day <= pd.Timestamp(end_date)
+    expected = calculate_kpis(customers_df, accounts_df, transactions_df[in_window])
+
+    actual = prefix.window_kpis(kpis, start_date, end_date)
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, nan_ok=True), key
+
+
+def test_no_transactions():
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*string_frames(0))
+    prefix = DailyPrefixSums(build_daily_cube(customers_df, accounts_df, transactions_df))
+    totals = prefix.window_totals('2025-03-01', '2025-03-31')
+    assert totals['total_transactions'] == 0 and totals['total_volume'] == 0
+    assert np.isnan(totals['avg_transaction_size'])
@@ -0,0 +1,76 @@
+# tests/test_snapshot.py
+#
+# Snapshots give back the compact frames and ids they were written from,
+# for synthetic ids and for the labels of a real export, and a directory
+# without snapshot.json is not opened.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import START_DATE, string_frames, with_null_enums, with_orphans
+from innbucks.compact import LabelIds, SyntheticIds
+from innbucks.data import generate_compact_data
+from innbucks.snapshot import METADATA, open_snapshot, write_snapshot
+from innbucks.sources import TABLES, open_source
+
+
+# Transactions as a snapshot stores them, in date order
+def by_date(transactions_df):
+    return transactions_df.sort_values('transaction_date', kind='stable', ignore_index=True)
+
+
+def assert_same_dataset(snapshot, original):
+    for loaded, frame in zip(snapshot[:3], (*original[:2], by_date(original[2]))):
+        pd.testing.assert_frame_equal(loaded, frame)
+    ids, expected = snapshot[3], original[3]
+    for method, n in [('customer_ids', len(original[0])), ('account_ids', len(original[1])),
+                      ('transaction_ids', len(original[2]))]:
+        keys = np.arange(n)
+        assert list(getattr(ids, method)(keys)) == list(getattr(expected, method)(keys)), method
+
+
+def test_synthetic_round_trip(tmp_path):
+    original = generate_compact_data(300, days=10, seed=7, start_date=START_DATE)
+    write_snapshot(str(tmp_path), *original)
+    snapshot = open_snapshot(str(tmp_path))
+
+    assert isinstance(snapshot[3], SyntheticIds)
+    assert_same_dataset(snapshot, original)
+    assert snapshot[2]['transaction_date'].is_monotonic_increasing
+
+
+def test_labelled_round_trip(tmp_path):
+    # A real export: labelled ids, unknown ids and missing enumeration values
+    frames = with_orphans(with_null_enums(string_frames(300)))
+    for name, df in zip(TABLES, frames):
+        df.to_parquet(tmp_path / f'{name}.parquet')
+    original = open_source(f'parquet:{tmp_path}').load_compact()
+    write_snapshot(str(tmp_path / 'snapshot'), *original)
+    snapshot = open_snapshot(str(tmp_path / 'snapshot'))
+
+    assert isinstance(snapshot[3], LabelIds)
+    assert_same_dataset(snapshot, original)
+    assert (snapshot[1]['customer_key'] == -1).any() and snapshot[0]['region'].isna().any()
+
+
+def test_source_loads_the_original_frames(tmp_path):
+    original = generate_compact_data(200, days=10, seed=7, start_date=START_DATE)
+    write_snapshot(str(tmp_path), *original)
+    customers_df, accounts_df, transactions_df = string_frames(200, days=10)
+    for loaded, frame in zip(open_source(f'snapshot:{tmp_path}').load(),
+                             (customers_df, accounts_df, by_date(transactions_df))):
+        pd.testing.assert_frame_equal(loaded, frame)
+
+
+def test_rewrite_over_a_snapshot(tmp_path):
+    write_snapshot(str(tmp_path), *generate_compact_data(300, days=10, seed=7, start_date=START_DATE))
+    smaller = generate_compact_data(100, days=10, seed=8, start_date=START_DATE)
+    write_snapshot(str(tmp_path), *smaller)
+    assert_same_dataset(open_snapshot(str(tmp_path)), smaller)
+
+
+def test_incomplete_snapshot(tmp_path):
+    write_snapshot(str(tmp_path), *generate_compact_data(50, days=10, seed=7, start_date=START_DATE))
+    (tmp_path / METADATA).unlink()
+    with pytest.raises(FileNotFoundError, match=METADATA):
+        open_snapshot(str(tmp_path))
@@ -0,0 +1,99 @@
+# tests/test_sources.py
+#
+# Parquet, CSV and SQLite sources return the frames they were written from,
+# missing enumeration values included, and reject exports that do not fit
+# SCHEMA.
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums
+from innbucks.sources import TABLES, SchemaError, open_source
+
+
+def write_parquet(directory, frames):
+    for name, df in zip(TABLES, frames):
+        df.to_parquet(os.path.join(directory, f'{name}.parquet'))
+
+
+def write_csv(directory, frames):
+    for name, df in zip(TABLES, frames):
+        df.to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+
+
+def write_sqlite(directory, frames):
+    path = os.path.join(directory, 'innbucks.db')
+    with sqlite3.connect(path) as conn:
+        for name, df in zip(TABLES, frames):
+            df.to_sql(name, conn, index=False)
+    return path
+
+
+WRITERS = {'parquet': write_parquet, 'csv': write_csv, 'sqlite': write_sqlite}
+
+
+def open_written(kind, directory, frames):
+    path = WRITERS[kind](directory, frames) or directory
+    return open_source(f'{kind}:{path}')
+
+
+# Values as plain objects with None for every kind of missing value
+def plain(df):
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+@pytest.mark.parametrize('kind', WRITERS)
+def test_round_trip(tmp_path, kind):
+    frames = with_null_enums(string_frames(200))
+    source = open_written(kind, tmp_path, frames)
+    for loaded, original in zip(source.load(), frames):
+        pd.testing.assert_frame_equal(plain(loaded), plain(original), check_exact=False)
+
+    customers_df, _, transactions_df, _ = source.load_compact()
+    assert customers_df['region'].isna().sum() == frames[0]['region'].isna().sum()
+    assert transactions_df['channel'].isna().sum() == frames[2]['channel'].isna().sum()
+
+
+def test_extra_columns_are_ignored(tmp_path):
+    customers_df, accounts_df, transactions_df = string_frames(50)
+    write_parquet(tmp_path, (customers_df.assign(notes='x'), accounts_df, transactions_df))
+    assert 'notes' not in open_source(f'parquet:{tmp_path}').load()[0]
+
+
+@pytest.mark.parametrize('kind', WRITERS)
+def test_missing_column(tmp_path, kind):
+    customers_df, accounts_df, transactions_df = string_frames(50)
+    source = open_written(kind, tmp_path, (customers_df.drop(columns='region'), accounts_df, transactions_df))
+    with pytest.raises(SchemaError, match='region'):
+        source.load()
+
+
+def test_null_key(tmp_path):
+    customers_df, accounts_df, transactions_df = string_frames(50)
+    transactions_df = transactions_df.astype({'account_id': object})
+    transactions_df.loc[3, 'account_id'] = None
+    write_parquet(tmp_path, (customers_df, accounts_df, transactions_df))
+    with pytest.raises(SchemaError, match='account_id'):
+        open_source(f'parquet:{tmp_path}').load()
+
+
+def test_unparseable_date(tmp_path):
+    customers_df, accounts_df, transactions_df = string_frames(50)
+    transactions_df = transactions_df.astype({'transaction_date': str})
+    transactions_df.loc[0, 'transaction_date'] = 'yesterday'
+    write_csv(tmp_path, (customers_df, accounts_df, transactions_df))
+    with pytest.raises(SchemaError, match='transaction_date'):
+        open_source(f'csv:{tmp_path}').load()
+
+
+def test_unopenable_sqlite(tmp_path):
+    with pytest.raises(OSError):
+        open_source(f"sqlite:{tmp_path / 'missing.db'}").load()
+
+
+def test_unknown_source():
+    with pytest.raises(ValueError, match='ftp'):
+        open_source('ftp:/data')
@@ -0,0 +1,74 @@
+# tests/test_store.py
+#
+# TransactionStore keeps transactions sorted by date and answers date windows
+# and the newest transactions from that order.
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import string_frames
+from innbucks.compact import compact_frames
+from innbucks.store import TransactionStore, day_window
+
+
+# Compact transactions in the order the source returned them (by account)
+def source_transactions(n_customers=300):
+    return compact_frames(*string_frames(n_customers))[2]
+
+
+def test_store_sorts_by_date():
+    transactions_df = source_transactions()
+    store = TransactionStore(transactions_df)
+    assert store.transactions_df['transaction_date'].is_monotonic_increasing
+    assert sorted(store.transactions_df['transaction_key']) == sorted(transactions_df['transaction_key'])
+    # Stable: rows with the same timestamp keep their source order
+    for _, keys in store.transactions_df.groupby('transaction_date')['transaction_key']:
+        assert keys.is_monotonic_increasing
+    assert store.first_date == transactions_df['transaction_date'].min()
+    assert store.last_date == transactions_df['transaction_date'].max()
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None),
+    ('2025-03-05', '2025-03-12'),
+    ('2025-03-05 13:00', '2025-03-05 17:00'),
+    (None, '2025-03-02'),
+    ('2025-03-30', None),
+    ('2025-02-01', '2025-02-10'),
+    ('2025-03-12', '2025-03-05'),
+])
+def test_window_matches_date_filter(start, end):
+    store = TransactionStore(source_transactions())
+    dates = store.transactions_df['transaction_date']
+    mask = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        mask &= (dates >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (dates < pd.Timestamp(end)).to_numpy()
+    window = store.window(start, end)
+    assert (window.index.to_numpy() == np.flatnonzero(mask)).all()
+
+
+def test_day_window_covers_whole_days():
+    start, end = day_window('2025-03-05', pd.Timestamp('2025-03-07 15:30'))
+    assert (start, end) == (pd.Timestamp('2025-03-05'), pd.Timestamp('2025-03-08'))
+
+
+def test_empty_store():
+    store = TransactionStore(compact_frames(*string_frames(0))[2])
+    assert len(store) == 0
+    assert store.first_date is None and store.last_date is None
+    assert store.bounds('2025-03-01', '2025-03-10') == (0, 0)
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2025-03-05', '2025-03-12'), ('2025-05-01', None)])
+@pytest.mark.parametrize('n, offset', [(10, 0), (25, 40), (1, 999), (5000, 0), (10, 10**6)])
+def test_latest_matches_sorted_window(start, end, n, offset):
+    store = TransactionStore(source_transactions())
+    window = store.window(start, end)
+    # Newest first is the date-sorted window reversed
+    expected = window.index.to_numpy()[::-1][offset:offset + n]
+
+    latest = store.latest(n, offset, start=start, end=end)
+    assert (latest.index.to_numpy() == expected).all()
+    assert latest['transaction_date'].is_monotonic_decreasing
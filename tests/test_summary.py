@@ -0,0 +1,22 @@
+# tests/test_summary.py
+#
+# The positional Account Summary join against a pandas merge.
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_orphans
+from innbucks.compact import compact_frames
+from innbucks.summary import AccountSummary
+
+
+@pytest.mark.parametrize('frames', [string_frames(200), with_orphans(string_frames(200)), string_frames(0)])
+def test_summary_matches_merge(frames):
+    customers_df, accounts_df, _, _ = compact_frames(*frames)
+    summary = AccountSummary(customers_df, accounts_df)
+
+    expected = accounts_df.merge(customers_df, on='customer_key', how='inner', sort=False)
+    pd.testing.assert_frame_equal(summary.frame, expected[summary.frame.columns], check_dtype=False)
+    assert len(summary) == len(expected)
+    assert summary.total_balance_cents == expected['balance_cents'].sum()
+    if len(expected):
+        assert summary.mean_balance_cents == pytest.approx(expected['balance_cents'].mean())
@@ -0,0 +1,94 @@
+# tests/test_table.py
+#
+# DatasetTables pages and counts against filtering, sorting and slicing the
+# frames with pandas.
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_null_enums
+from innbucks.cache import build_dataset
+from innbucks.compact import expand_frame
+from innbucks.sources import TABLES
+from innbucks.table import DatasetTables, page_count
+
+
+# A Parquet-sourced dataset with missing enumeration values
+@pytest.fixture(scope='module')
+def dataset(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('parquet')
+    for name, df in zip(TABLES, with_null_enums(string_frames(300))):
+        df.to_parquet(directory / f'{name}.parquet')
+    return build_dataset(f'parquet:{directory}')
+
+
+def frame(dataset, table):
+    return {
+        'customers': dataset.customers_df,
+        'transactions': dataset.transactions_df,
+        'account_summary': dataset.account_summary.frame,
+    }[table]
+
+
+def expected_page(dataset, table, page, page_size, filters, sort_by, descending, start=None, end=None):
+    df = frame(dataset, table)
+    mask = pd.Series(True, index=df.index)
+    for col, selected in (filters or {}).items():
+        if selected:
+            mask &= df[col].isin([selected] if isinstance(selected, str) else selected)
+    if start is not None:
+        mask &= df['transaction_date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['transaction_date'] < pd.Timestamp(end)
+    df = df[mask]
+    if sort_by is not None:
+        # Missing values sort before every value
+        df = df.sort_values(
+            sort_by, ascending=not descending, kind='stable', na_position='last' if descending else 'first'
+        )
+    return expand_frame(df.iloc[page * page_size:(page + 1) * page_size], dataset.ids), len(df)
+
+
+CASES = [
+    ('customers', {}, None, False),
+    ('customers', {'region': 'Harare'}, None, False),
+    ('customers', {'region': ['Harare', 'Midlands'], 'kyc_status': 'Verified'}, 'mobile_network', False),
+    ('customers', {'customer_type': 'No Such Type'}, None, False),
+    ('customers', {}, 'region', True),
+    ('customers', {'kyc_status': ['Pending']}, 'customer_key', True),
+    ('transactions', {}, 'amount_cents', True),
+    ('transactions', {'channel': 'USSD'}, None, False),
+    ('transactions', {'transaction_type': ['Cash In', 'Airtime']}, 'channel', False),
+    ('account_summary', {}, None, False),
+    ('account_summary', {}, 'balance_cents', True),
+    ('account_summary', {}, 'region', False),
+]
+
+
+@pytest.mark.parametrize('table, filters, sort_by, descending', CASES)
+@pytest.mark.parametrize('window', [(None, None), ('2025-03-05', '2025-03-12')])
+def test_page_and_count_match_pandas(dataset, table, filters, sort_by, descending, window):
+    tables = DatasetTables(dataset).window(*window)
+    window = window if table == 'transactions' else (None, None)
+    for page, page_size in [(0, 25), (3, 25), (1, 100), (1000, 50)]:
+        expected, n_rows = expected_page(dataset, table, page, page_size, filters, sort_by, descending, *window)
+        actual = tables.page(table, page, page_size, filters, sort_by, descending)
+        pd.testing.assert_frame_equal(actual, expected)
+    assert tables.count(table, filters) == n_rows
+
+
+def test_sort_orders_are_cached(dataset):
+    tables = DatasetTables(dataset)
+    tables.page('customers', 0, 10, sort_by='region')
+    order = dataset.sort_orders['customers'].order('region')
+    tables.page('customers', 1, 10, sort_by='region')
+    assert dataset.sort_orders['customers'].order('region') is order
+
+
+def test_account_summary_cannot_be_filtered(dataset):
+    with pytest.raises(ValueError):
+        DatasetTables(dataset).page('account_summary', 0, 10, {'region': 'Harare'})
+
+
+@pytest.mark.parametrize('n_rows, page_size, expected', [(0, 50, 1), (1, 50, 1), (50, 50, 1), (51, 50, 2)])
+def test_page_count(n_rows, page_size, expected):
+    assert page_count(n_rows, page_size) == expected
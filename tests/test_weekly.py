@@ -0,0 +1,48 @@
+# tests/test_weekly.py
+#
+# Week-over-week changes against counting the two 7-day weeks directly.
+import pandas as pd
+import pytest
+
+from conftest import string_frames, with_orphans
+from innbucks.compact import compact_frames
+from innbucks.weekly import WeeklyAggregates
+
+
+# Transactions, cents and distinct known customers over the days [first, last]
+def week_totals(customers_df, accounts_df, transactions_df, first, last):
+    day = transactions_df['transaction_date'].dt.normalize()
+    week = transactions_df[(day >= first) & (day <= last)]
+    owners = week.merge(accounts_df[['account_id', 'customer_id']], on='account_id')
+    owners = owners[owners['customer_id'].isin(customers_df['customer_id'])]
+    return len(week), int((week['amount_usd'] * 100).round().sum()), owners['customer_id'].nunique()
+
+
+@pytest.mark.parametrize('frames', [string_frames(300, days=40), with_orphans(string_frames(300, days=40))])
+@pytest.mark.parametrize('end_date', [None, '2025-04-09', '2025-04-01', '2025-03-24'])
+def test_change_matches_direct_counts(frames, end_date):
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*frames)
+    change = WeeklyAggregates(accounts_df, transactions_df).change(end_date)
+
+    last_day = frames[2]['transaction_date'].max().normalize()
+    weeks_back = 0 if end_date is None else -(-(last_day - pd.Timestamp(end_date)).days // 7)
+    week_end = last_day - pd.Timedelta(days=7 * weeks_back)
+    current = week_totals(*frames, week_end - pd.Timedelta(days=6), week_end)
+    previous = week_totals(*frames, week_end - pd.Timedelta(days=13), week_end - pd.Timedelta(days=7))
+    assert change == {
+        'customers': current[2] - previous[2],
+        'transactions': current[0] - previous[0],
+        'volume': pytest.approx((current[1] - previous[1]) / 100),
+    }
+
+
+@pytest.mark.parametrize('days, end_date', [(10, None), (40, '2025-03-10'), (40, '2025-05-01')])
+def test_change_without_two_full_weeks(days, end_date):
+    customers_df, accounts_df, transactions_df, _ = compact_frames(*string_frames(300, days=days))
+    change = WeeklyAggregates(accounts_df, transactions_df).change(end_date)
+    assert change == {'customers': None, 'transactions': None, 'volume': None}
+
+
+def test_no_transactions():
+    _, accounts_df, transactions_df, _ = compact_frames(*string_frames(0))
+    assert WeeklyAggregates(accounts_df, transactions_df).change()['transactions'] is None
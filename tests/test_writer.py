@@ -0,0 +1,77 @@
+# tests/test_writer.py
+#
+# The out-of-core writer: with the default chunk size its output reads back
+# as the in-memory generator's data, smaller chunks still give one dataset,
+# and a rerun carries on from the chunks already recorded.
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import START_DATE, string_frames
+from innbucks.sources import open_source
+from innbucks.writer import PROGRESS, write_dataset
+
+START = START_DATE.date().isoformat()
+
+
+def read_back(out):
+    customers_df, accounts_df, transactions_df = open_source(f'parquet:{out}').load()
+    # Transactions come back grouped by date partition
+    return customers_df, accounts_df, transactions_df.sort_values('transaction_id', ignore_index=True)
+
+
+def write(out, n_customers, logged=None, **params):
+    params = {'days': 5, 'seed': 7, 'start_date': START, **params}
+    log = logged.append if logged is not None else (lambda line: None)
+    return write_dataset(str(out), n_customers, log=log, **params)
+
+
+def test_matches_generator(tmp_path):
+    expected = string_frames(300, days=5)
+    assert write(tmp_path, 300) == (300, len(expected[2]))
+    for loaded, original in zip(read_back(tmp_path), expected):
+        original = original.sort_values(list(original)[:1], ignore_index=True)
+        pd.testing.assert_frame_equal(loaded, original, check_dtype=False, check_exact=False)
+
+
+def test_small_chunks(tmp_path):
+    n_customers, n_transactions = write(tmp_path, 250, chunk_customers=100)
+    assert len(os.listdir(tmp_path / 'customers')) == 3
+    customers_df, accounts_df, transactions_df = read_back(tmp_path)
+
+    assert len(customers_df) == n_customers == 250 and len(transactions_df) == n_transactions
+    # Ids carry on across chunks as they do in one generated dataset
+    assert list(customers_df['customer_id']) == list(string_frames(250, days=5)[0]['customer_id'])
+    assert transactions_df['transaction_id'].is_unique
+    assert transactions_df['account_id'].isin(accounts_df['account_id']).all()
+    dates = transactions_df['transaction_date']
+    assert dates.min() >= START_DATE and dates.max() < START_DATE + pd.Timedelta(days=5)
+
+
+def test_resume(tmp_path):
+    logged = []
+    totals = write(tmp_path, 250, logged, chunk_customers=100)
+    assert len(logged) == 4
+    before = read_back(tmp_path)
+
+    # Everything recorded: nothing is written again
+    logged.clear()
+    assert write(tmp_path, 250, logged, chunk_customers=100) == totals
+    assert len(logged) == 1
+
+    # An interrupted last chunk is written again, the others are kept
+    os.remove(tmp_path / PROGRESS / 'part-00002.json')
+    os.remove(tmp_path / 'customers' / 'part-00002.parquet')
+    logged.clear()
+    assert write(tmp_path, 250, logged, chunk_customers=100, start_date=None) == totals
+    assert len(logged) == 2 and logged[0].startswith('chunk 3/3')
+    for loaded, original in zip(read_back(tmp_path), before):
+        pd.testing.assert_frame_equal(loaded, original)
+
+
+@pytest.mark.parametrize('params', [{'seed': 8}, {'chunk_customers': 50}, {'start_date': '2025-04-01'}])
+def test_different_parameters(tmp_path, params):
+    write(tmp_path, 250, chunk_customers=100)
+    with pytest.raises(ValueError, match='different parameters'):
+        write(tmp_path, 250, **{'chunk_customers': 100, **params})